@@ -3,34 +3,140 @@ A text-based implementation of Hearts, a classic trick-taking game played with a
 
 Games are played against three computer opponents.  The AI of the opponents is primitive - they will never cheat, but
 they will not play with any strategy.
+
+Games can also be played headless between four computer players, with no delays or output and a seeded random number
+generator, which is used to evaluate AI policies over large numbers of hands:
+
+    python hearts.py --simulate 10000 --seed 1
 """
 
+import argparse
 import random
-from time import sleep
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from time import perf_counter, sleep
+
+
+# Cards are stored as integers from 0 to 51, numbered by suit in the order clubs, spades, hearts, diamonds and then by
+# rank from 2 to Ace.  A set of cards (a hand, a trick or a player's penalty cards) is a 52-bit integer with one bit per
+# card, so suit checks, legal moves, trick winners and penalty counts are all a handful of bit operations.
+SUITS = "CSHD"
+CLUBS, SPADES, HEARTS, DIAMONDS = range(4)
+SUIT_MASKS = tuple(0x1FFF << (13 * suit) for suit in range(4))
+TWO_OF_CLUBS = 1 << 0
+QUEEN_OF_SPADES = 1 << (13 * SPADES + 10)
+PENALTY_CARDS = SUIT_MASKS[HEARTS] | QUEEN_OF_SPADES
+FULL_DECK = (1 << 52) - 1
+
+
+def make_card(rank, suit):
+    """Converts a (rank, suit) pair such as (12, "S") to its card number"""
+    return SUITS.index(suit) * 13 + rank - 2
+
+
+def card_rank(card):
+    return card % 13 + 2
+
+
+def card_suit(card):
+    return card // 13
+
+
+def hand_cards(hand):
+    """Returns the card numbers in a hand mask in sorted order, which is only needed for display"""
+    cards = []
+    while hand:
+        low_bit = hand & -hand
+        cards.append(low_bit.bit_length() - 1)
+        hand ^= low_bit
+    return cards
+
+
+def legal_moves(hand, lead_suit, first_trick, hearts_broken):
+    """Returns the mask of cards in a hand that can legally be played
+
+    Arguments:
+        hand: The player's hand mask
+        lead_suit: The suit that was led, or None if the player is leading the trick
+        first_trick: Whether this is the first trick of the hand
+        hearts_broken: Whether hearts have been played in an earlier trick
+
+    Returns:
+        int: The mask of legal cards
+    """
+    # The player holding the 2 of Clubs must lead it
+    if hand & TWO_OF_CLUBS:
+        return TWO_OF_CLUBS
+    if lead_suit is None:
+        # Hearts can't be led until they are broken, unless the player has nothing else
+        if not hearts_broken and hand & ~SUIT_MASKS[HEARTS]:
+            return hand & ~SUIT_MASKS[HEARTS]
+        return hand
+    # Players must follow suit if they can
+    following = hand & SUIT_MASKS[lead_suit]
+    if following:
+        return following
+    # Penalty cards can't be played on the first trick, unless the player has nothing else
+    if first_trick and hand & ~PENALTY_CARDS:
+        return hand & ~PENALTY_CARDS
+    return hand
+
+
+def trick_winner(trick, lead_suit):
+    """Returns the winning card of a trick, which is the highest card of the lead suit"""
+    return (trick & SUIT_MASKS[lead_suit]).bit_length() - 1
+
+
+def penalty_points(cards):
+    """Returns the penalty points in a set of cards, which is 1 per heart and 13 for the Queen of Spades"""
+    return (cards & SUIT_MASKS[HEARTS]).bit_count() + (13 if cards & QUEEN_OF_SPADES else 0)
+
+
+def random_card(cards, rng):
+    """Picks a card uniformly at random from a mask of cards"""
+    for i in range(rng.randrange(cards.bit_count())):
+        cards &= cards - 1
+    return (cards & -cards).bit_length() - 1
+
+
+# Everything a player is allowed to know when making a decision.  It is immutable and only holds ints and tuples, so
+# players can keep it or copy it cheaply.
+#   seat: the seat making the decision, from 0 to 3
+#   hand, legal: the player's hand, and the cards in it that can legally be played (or passed)
+#   leader, trick, lead_suit: the seat that led the current trick, the cards played to it so far in order, and the
+#       suit led (None if the player is leading)
+#   first_trick, hearts_broken: whether this is the first trick of the hand, and whether hearts have been broken
+#   played: every card played so far this hand, including the current trick
+#   voids: a mask for each seat with one bit for each suit they have shown out of
+#   cards_held: the number of cards in each seat's hand
+#   points: the penalty points each seat has taken so far this hand
+#   scores: each seat's score at the start of the hand
+#   pass_num, passed, received: how many seats to the left cards are passed this hand, the cards the player passed,
+#       and the cards they received
+#   names: each seat's name
+GameState = namedtuple("GameState", ["seat", "hand", "legal", "leader", "trick", "lead_suit", "first_trick",
+                                     "hearts_broken", "played", "voids", "cards_held", "points", "scores", "pass_num",
+                                     "passed", "received", "names"])
 
 
 # A generic player class, which is inherited by both the Human and Computer classes
-class Player:
+#
+# Players make two decisions, each given a GameState: choose_pass returns a mask of three cards to pass, and
+# choose_card returns a legal card to play.  The game removes the cards from the player's hand itself.
+class Player(ABC):
     def __init__(self):
-        self.hand = []
-        self.penalty_cards = []
+        self.hand = 0
+        self.penalty_cards = 0
         self.score = 0
-        self.incoming_cards = []
+        self.incoming_cards = 0
 
-    # Determines if the player has the lead suit
-    def has_lead_suit(self, lead_suit):
-        for card in self.hand:
-            if card[1] == lead_suit:
-                return True
-        return False
+    @abstractmethod
+    def choose_card(self, state):
+        pass
 
-    def organize_hand(self):
-        organized_hand = []
-        for suit in ["C", "S", "H", "D"]:
-            for rank in range(2, 15):
-                if (rank, suit) in self.hand:
-                    organized_hand.append((rank, suit))
-        self.hand = organized_hand
+    @abstractmethod
+    def choose_pass(self, state):
+        pass
 
 
 # Used to create the Human player object
@@ -39,222 +145,251 @@ class Human(Player):
         super().__init__()
         self.name = "You"
 
-    def print_hand(self):
-        for card_num, card in enumerate(self.hand):
+    def print_hand(self, hand):
+        for card_num, card in enumerate(hand_cards(hand)):
             print("{:<2} {:>3}".format(card_num + 1, get_card_name(card)))
 
     # Determines which card the player will play on their turn
-    def play_card(self, lead_suit, leading, first_trick, hearts_broken):
+    def choose_card(self, state):
         # If the player has the 2 of Clubs, they must play it
-        if (2, "C") in self.hand and first_trick:
-            self.hand.remove((2, "C"))
-            return 2, "C"
+        if state.hand & TWO_OF_CLUBS and state.first_trick:
+            return 0
         else:
             while True:
                 print()
-                if leading:
-                    if hearts_broken:
+                if state.lead_suit is None:
+                    if state.hearts_broken:
                         print("Hearts have been broken.")
                     else:
                         print("Hearts have not been broken.")
                 else:
-                    print("Lead suit: " + lead_suit)
+                    print("Lead suit: " + SUITS[state.lead_suit])
                 print("Choose a card to play.")
                 print()
-                self.print_hand()
+                self.print_hand(state.hand)
                 print()
                 user_input = input()
 
                 # Gets input from the user on which card to play
                 try:
-                    card_to_play = self.hand[int(user_input) - 1]
+                    card_to_play = hand_cards(state.hand)[int(user_input) - 1]
                 except (ValueError, IndexError):
                     print("Please enter a valid number.")
                     sleep(3)
                     continue
 
-                # Handles playing a card when leading the trick
-                if leading:
-                    if hearts_broken or card_to_play[1] != "H":
-                        self.hand.remove(card_to_play)
-                        return(card_to_play)
-                    else:
-                        print("Hearts are not broken.  Play a different card.")
-
-                # Handles playing a card when not leading the trick
+                # Plays the card if it is legal, or explains why it isn't
+                if state.legal & (1 << card_to_play):
+                    return card_to_play
+                elif state.lead_suit is None:
+                    print("Hearts are not broken.  Play a different card.")
+                elif card_suit(card_to_play) != state.lead_suit and state.hand & SUIT_MASKS[state.lead_suit]:
+                    print("You must follow suit.")
                 else:
-                    # Makes sure you follow suit if possible
-                    if card_to_play[1] == lead_suit or not self.has_lead_suit(lead_suit):
-                        # Makes sure you don't play points on the first trick
-                        if not first_trick or (card_to_play[1] != "H" and card_to_play != (12, "S")):
-                            self.hand.remove(card_to_play)
-                            return(card_to_play)
-                        else:
-                            print("You cannot play penalty cards on the first trick.")
-                    else:
-                        print("You must follow suit.")
+                    print("You cannot play penalty cards on the first trick.")
                 print()
                 print()
                 sleep(3)
 
-    def pass_cards(self, pass_direction, pass_name):
+    def choose_pass(self, state):
+        pass_direction = {1: "left", 2: "across", 3: "right"}[state.pass_num]
+        pass_name = state.names[(state.seat + state.pass_num) % 4]
         while True:
             print("You are passing {} to {}.".format(pass_direction, pass_name))
             print("Choose three cards to pass.")
             print()
-            self.print_hand()
+            self.print_hand(state.hand)
             print()
             user_input = input()
             try:
                 input_list = list(map(lambda x: int(x), user_input.split()))
                 input_list = set(input_list)
-                if len(input_list) != 3:
+                if len(input_list) != 3 or min(input_list) < 1:
                     raise IndexError
-                cards_to_pass = [self.hand[x-1] for x in input_list]
+                cards = hand_cards(state.hand)
+                cards_to_pass = 0
+                for x in input_list:
+                    cards_to_pass |= 1 << cards[x - 1]
             except (ValueError, IndexError):
                 print("Please enter three valid numbers")
                 sleep(3)
                 continue
-            break
-
-        for card in cards_to_pass:
-            self.hand.remove(card)
-        return cards_to_pass
+            return cards_to_pass
 
 
 # Used to create the three computer player objects
 class Computer(Player):
-    def __init__(self):
+    def __init__(self, name=None, rng=random):
         super().__init__()
-        self.name = random.choice(names)
-        names.remove(self.name)
+        # Headless games name their players explicitly so the shared name pool isn't used up
+        if name is None:
+            name = random.choice(names)
+            names.remove(name)
+        self.name = name
+        self.rng = rng
 
     # Determines which card the computer will play
-    # This is done by determining which cards are legal to play and randomly choosing one
-    def play_card(self, lead_suit: str, leading: bool, first_trick, hearts_broken: bool):
-        if (2, "C") in self.hand:
-            card_to_play = (2, "C")
-        else:
-            if leading:
-                if hearts_broken:
-                    card_to_play = random.choice(self.hand)
-                else:
-                    viable_cards = list(filter(lambda card: card[1] != "H", self.hand))
-                    if len(viable_cards) > 0:
-                        card_to_play = random.choice(viable_cards)
-                    else:
-                        card_to_play = random.choice(self.hand)
-            else:
-                if self.has_lead_suit(lead_suit):
-                    viable_cards = list(filter(lambda card: card[1] == lead_suit, self.hand))
-                    card_to_play = random.choice(viable_cards)
-                else:
-                    card_to_play = random.choice(self.hand)
-
-        self.hand.remove(card_to_play)
-        return card_to_play
+    # This is done by randomly choosing one of the legal cards
+    def choose_card(self, state):
+        return random_card(state.legal, self.rng)
 
     # Used to determine which 3 cards to pass at the start of each hand, which is done at random
-    def pass_cards(self, *args):
-        cards_to_pass = []
+    def choose_pass(self, state):
+        hand = state.hand
+        cards_to_pass = 0
         for num in range(3):
-            card = random.choice(self.hand)
-            cards_to_pass.append(card)
-            self.hand.remove(card)
+            card = random_card(hand, self.rng)
+            cards_to_pass |= 1 << card
+            hand ^= 1 << card
         return cards_to_pass
 
 
-def play_game():
+def play_game(players=None, verbose=True, rng=random, log=None, profiler=None):
+    """Plays a full game of Hearts and returns the results
+
+    Arguments:
+        players: The four players, in seating order.  Defaults to a Human and three Computer opponents.
+        verbose: Whether to print the game and pause between plays.  Headless games set this to False.
+        rng: The random number generator used to shuffle the deck
+        log: A hearts_log.GameLogWriter that records every deal, pass, trick and score of the game
+        profiler: A hearts_profiler.DecisionProfiler that measures how long each player takes to make each decision
+
+    Returns:
+        dict: The final scores, the winning seat, and the penalty points and moon shooter of each hand
+    """
+    def show(text="", delay=0):
+        if verbose:
+            print(text)
+            if delay:
+                sleep(delay)
+
+    def decide(player, decision, state):
+        # Asks a player for a decision, timing it if the game is being profiled
+        if profiler:
+            return profiler.measure(player, decision, state)
+        return getattr(player, decision)(state)
+
     def play_hand(hand_num):
+        def game_state(seat, legal, leader, trick, lead_suit, first_trick, hearts_broken):
+            return GameState(seat, players[seat].hand, legal, leader, tuple(trick), lead_suit, first_trick,
+                             hearts_broken, played, tuple(voids), tuple(cards_held), tuple(points), scores,
+                             player_pass_num, passed[seat], received[seat], player_names)
+
         def deal_cards():
-            # Builds deck
-            deck = []
-            for suit in ["H", "D", "S", "C"]:
-                for rank in range(2, 15):
-                    deck.append((rank, suit))
-            random.shuffle(deck)
-            # Deals cards
-            for player in players:
-                player.hand.extend([deck.pop() for x in range(13)])
-                player.organize_hand()
+            # Shuffles the deck and deals 13 cards to each player
+            deck = list(range(52))
+            rng.shuffle(deck)
+            for player_pos, player in enumerate(players):
+                player.hand = 0
+                for card in deck[player_pos * 13:player_pos * 13 + 13]:
+                    player.hand |= 1 << card
 
         def pass_cards():
-            for player_pos, player in enumerate(players):  # For each player:
+            # Every player chooses before any cards change hands, so no one sees what they'll receive first
+            choices = []
+            for player_pos, player in enumerate(players):
+                state = game_state(player_pos, player.hand, None, (), None, True, False)
+                cards_to_pass = decide(player, "choose_pass", state)  # gets the cards the passing player wants to pass
+                if cards_to_pass & ~player.hand or cards_to_pass.bit_count() != 3:
+                    raise ValueError(f"{player.name} tried to pass cards they don't hold")
+                choices.append(cards_to_pass)
+            for player_pos, cards_to_pass in enumerate(choices):  # For each player:
                 player_to_pass_to = (player_pos + player_pass_num) % 4  # figures out which player they will pass to
-                pass_direction = {1: "left", 2: "across", 3: "right"}[
-                    player_pass_num]  # gets the name of the direction being passed to display to the screen
-                pass_name = players[player_to_pass_to].name  # gets the name of the player being passed to
-                cards_to_pass = player.pass_cards(pass_direction,
-                                                  pass_name)  # gets the cards the passing player wants to pass
+                passed[player_pos] = cards_to_pass
+                received[player_to_pass_to] = cards_to_pass
                 players[player_to_pass_to].incoming_cards = cards_to_pass  # passes the cards
-            for player in players:
-                player.hand.extend(player.incoming_cards)  # adds cards passed to each player to that player's hand
-                player.organize_hand()
+            if log:
+                log.passes(received)
+            for player_pos, player in enumerate(players):
+                player.hand ^= passed[player_pos]  # removes the passed cards from each player's hand
+                player.hand |= player.incoming_cards  # adds cards passed to each player to that player's hand
 
         def play_trick(leading_player, first_trick, hearts_broken):
+            nonlocal played
 
-            # Everyone plays a card
-            played_cards = [None, None, None, None]
-            for num in list(range(4)):
+            # Everyone plays a card, recording who played it so the winning card can be traced back to its player
+            trick = 0
+            trick_order = []
+            lead_suit = None
+            for num in range(4):
                 current_player = (num + leading_player) % 4
-                if current_player == leading_player:
-                    played_cards[current_player] = players[current_player].play_card("any", True, first_trick,
-                                                                                     hearts_broken)
-                    lead_suit = played_cards[current_player][1]
-                else:
-                    played_cards[current_player] = players[current_player].play_card(lead_suit, False, first_trick,
-                                                                                     hearts_broken)
-                print(players[current_player].name + " played " + get_card_name(played_cards[current_player]))
-                sleep(2)
+                player = players[current_player]
+                legal = legal_moves(player.hand, lead_suit, first_trick, hearts_broken)
+                state = game_state(current_player, legal, leading_player, trick_order, lead_suit, first_trick,
+                                   hearts_broken)
+                card = decide(player, "choose_card", state)
+                if not legal >> card & 1:
+                    raise ValueError(f"{player.name} tried to play {get_card_name(card)}, which isn't legal")
+                player.hand ^= 1 << card
+                if lead_suit is None:
+                    lead_suit = card_suit(card)
+                elif card_suit(card) != lead_suit:
+                    voids[current_player] |= 1 << lead_suit
+                trick |= 1 << card
+                played |= 1 << card
+                cards_held[current_player] -= 1
+                trick_order.append(card)
+                card_owners[card] = current_player
+                trick_cards[current_player] = card
+                show(player.name + " played " + get_card_name(card), 2)
 
             # Checks if hearts were just broken
-            for card in played_cards:
-                if card[1] == "H":
-                    hearts_broken = True
+            if trick & SUIT_MASKS[HEARTS]:
+                hearts_broken = True
 
             # Determines winner of trick
-            highest_card = (0, 0)
-            for pos, card in enumerate(played_cards):
-                if card[1] == lead_suit and card[0] > highest_card[0]:
-                    highest_card = card
-                    highest_pos = pos
-            print(players[highest_pos].name + " won the trick.")
-            sleep(3)
-            print()
-            print()
-            print()
+            highest_pos = card_owners[trick_winner(trick, lead_suit)]
+            if log:
+                log.trick(leading_player, trick_cards, highest_pos)
+            show(players[highest_pos].name + " won the trick.", 3)
+            show()
+            show()
+            show()
 
             # Gives penalty cards to winner of trick
-            for card in played_cards:
-                if card == (12, "S") or card[1] == "H":
-                    players[highest_pos].penalty_cards.append(card)
+            players[highest_pos].penalty_cards |= trick & PENALTY_CARDS
+            points[highest_pos] += penalty_points(trick)
 
             # Returns winning player to lead the next trick
             return highest_pos, hearts_broken
 
         def print_scores():
             width = 16
-            print("|" + "SCORES".center(width - 2, "=") + "|")
+            show("|" + "SCORES".center(width - 2, "=") + "|")
             for player in players:
                 score = "|" + player.name.ljust(width - 5, ".") + str(player.score).rjust(3, "0") + "|"
-                print(score)
-            print("|" + "=" * (width - 2) + "|")
-            print()
-            print()
+                show(score)
+            show("|" + "=" * (width - 2) + "|")
+            show()
+            show()
+
+        # The public record of the hand, which is used to build each player's GameState
+        played = 0
+        voids = [0, 0, 0, 0]
+        cards_held = [13, 13, 13, 13]
+        points = [0, 0, 0, 0]
+        passed = [0, 0, 0, 0]
+        received = [0, 0, 0, 0]
+        scores = tuple(player.score for player in players)
 
         hearts_broken = False
+        for player in players:
+            player.penalty_cards = 0
         deal_cards()
-        pass_cards()
+        if log:
+            log.deal(player_pass_num, [player.hand for player in players])
+        # Every fourth hand is a "hold" hand where no cards are passed
+        if player_pass_num:
+            pass_cards()
 
         # Finds the player holding the 2 of Clubs and sets them to lead the first trick
         for player_pos, player in enumerate(players):
-            if (2, "C") in player.hand:
+            if player.hand & TWO_OF_CLUBS:
                 leading_player = player_pos
                 break
 
         # Plays the hand
-        print("Hand " + str(hand_num))
-        sleep(3)
+        show("Hand " + str(hand_num), 3)
         first_trick = True
         for i in range(13):
             leading_player, hearts_broken = play_trick(leading_player, first_trick, hearts_broken)
@@ -262,62 +397,129 @@ def play_game():
 
         # Checks if someone shot the moon
         shot_moon = None
-        for player in players:
-            if len(player.penalty_cards) == 14:
-                shot_moon = player.name
-                print(f"{player.name} shot the moon!")
+        for player_pos, player in enumerate(players):
+            if player.penalty_cards == PENALTY_CARDS:
+                shot_moon = player_pos
+                show(f"{player.name} shot the moon!")
 
         # Distributes points
-        for player in players:
-            if shot_moon:
-                if player.name != shot_moon:
-                    player.score += 26
+        penalties = [0, 0, 0, 0]
+        for player_pos, player in enumerate(players):
+            if shot_moon is not None:
+                if player_pos != shot_moon:
+                    penalties[player_pos] = 26
             else:
-                for card in player.penalty_cards:
-                    if card == (12, "S"):
-                        player.score += 13
-                    else:
-                        player.score += 1
+                penalties[player_pos] = penalty_points(player.penalty_cards)
+            player.score += penalties[player_pos]
 
         # Displays scores
         print_scores()
+        if log:
+            log.hand_end(penalties)
+        return {"penalties": penalties, "shot_moon": shot_moon}
 
-    player1 = Human()
-    player2 = Computer()
-    player3 = Computer()
-    player4 = Computer()
-    players = [player1, player2, player3, player4]
+    if players is None:
+        players = [Human(), Computer(), Computer(), Computer()]
+    player_names = tuple(player.name for player in players)
+    card_owners = [0] * 52
+    trick_cards = [0, 0, 0, 0]
 
+    hands = []
     player_pass_num = 0
     hand_num = 1
     game_running = True
     while game_running:
         player_pass_num = [0, 1, 3, 2][hand_num % 4]  # finds the next direction to pass cards
-        play_hand(hand_num)
+        hands.append(play_hand(hand_num))
         hand_num += 1
         for player in players:
             if player.score >= 100:
                 game_running = False
 
     lowest_score = 1000
-    for player in players:
+    for player_pos, player in enumerate(players):
         if player.score < lowest_score:
-            winner = player
+            winner = player_pos
             lowest_score = player.score
 
-    print(f"Winner: {winner.name} with {winner.score} points!")
+    show(f"Winner: {players[winner].name} with {players[winner].score} points!")
+    if log:
+        log.game_end([player.score for player in players])
+    return {"scores": [player.score for player in players], "winner": winner, "hands": hands}
+
+
+def play_headless_game(seed=None, player_types=(Computer, Computer, Computer, Computer), log=None, profiler=None):
+    """Plays a full game between four computer players with no delays or output
+
+    Arguments:
+        seed: Seeds the game's random number generator, so the same seed always plays the same game
+        player_types: The class used for each of the four seats.  Each is called with a name and the game's rng.
+        log: A hearts_log.GameLogWriter to record the game to
+        profiler: A hearts_profiler.DecisionProfiler to measure each decision with
+
+    Returns:
+        dict: The results of the game, as returned by play_game
+    """
+    rng = random.Random(seed)
+    players = [player_type(name=f"Seat {seat + 1}", rng=rng) for seat, player_type in enumerate(player_types)]
+    return play_game(players, verbose=False, rng=rng, log=log, profiler=profiler)
+
+
+def simulate_games(num_games, seed=None, player_types=(Computer, Computer, Computer, Computer), log=None,
+                   profiler=None):
+    """Plays a batch of headless games, each seeded from a single master seed
+
+    Arguments:
+        num_games: The number of games to play
+        seed: The master seed, from which the seed for each game is drawn
+        player_types: The class used for each of the four seats
+        log: A hearts_log.GameLogWriter to record every game to
+        profiler: A hearts_profiler.DecisionProfiler to measure every decision with
+
+    Returns:
+        list: The results of each game
+    """
+    master_rng = random.Random(seed)
+    game_seeds = [master_rng.getrandbits(64) for i in range(num_games)]
+    return [play_headless_game(game_seed, player_types, log, profiler) for game_seed in game_seeds]
 
 
 def get_card_name(card):
     rank_names = {11: "J", 12: "Q", 13: "K", 14: "A"}
-    if card[0] < 11:
-        return str(card[0]) + card[1]
+    rank = card_rank(card)
+    if rank < 11:
+        return str(rank) + SUITS[card_suit(card)]
     else:
-        return rank_names[card[0]] + card[1]
+        return rank_names[rank] + SUITS[card_suit(card)]
 
 
 # Pool of names that is used to randomly name the computer opponents
 names = """Alice Andy Bob Cindy Clark Dan Danielle Ellen Frank Fiona Gina Gavin Henry Heather Isabel John Jasmine 
 Kayla Kyle Leon Mary Max Nick Nancy Paige Paul Rick Sam Sally Tammy Victor Wendy Xavier Yvette""".split()
 
-play_game()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play Hearts against three computer opponents.")
+    parser.add_argument("--simulate", type=int, metavar="GAMES",
+                        help="play this many headless computer-only games and print summary statistics")
+    parser.add_argument("--seed", type=int, help="master seed for headless games")
+    parser.add_argument("--log", metavar="PATH", help="record the headless games to a binary game log")
+    args = parser.parse_args()
+
+    if args.simulate:
+        start_time = perf_counter()
+        if args.log:
+            from hearts_log import GameLogWriter
+            with GameLogWriter(args.log) as game_log:
+                results = simulate_games(args.simulate, args.seed, log=game_log)
+        else:
+            results = simulate_games(args.simulate, args.seed)
+        elapsed = perf_counter() - start_time
+        num_hands = sum(len(result["hands"]) for result in results)
+        wins = [0, 0, 0, 0]
+        for result in results:
+            wins[result["winner"]] += 1
+        print(f"Played {args.simulate} games ({num_hands} hands) in {elapsed:.2f}s "
+              f"({num_hands / elapsed * 3600:,.0f} hands per hour)")
+        print("Wins by seat: " + ", ".join(str(win) for win in wins))
+    else:
+        play_game()
@@ -0,0 +1,259 @@
+"""
+A search-based computer player for Hearts.
+
+Before each play, the MonteCarloComputer deals the cards it can't see to the other players at random, in a way that
+agrees with everything it knows (which suits each player has shown out of, and which cards it passed to whom).  It then
+tries each of its legal cards on that deal and plays the rest of the hand out at random with a fast bitmask playout.
+This is repeated until its time budget runs out, and the card with the lowest average penalty is played.
+
+The DoubleDummyComputer uses the double-dummy solver in hearts_solver.py as its leaf evaluator once the hand is down to
+its last few cards: each sampled deal is solved exactly for each legal card instead of being played out at random.
+"""
+
+import math
+import random
+from time import perf_counter
+
+from hearts import (FULL_DECK, HEARTS, QUEEN_OF_SPADES, SPADES, SUIT_MASKS, Computer, card_rank, card_suit, hand_cards,
+                    legal_moves, penalty_points, random_card)
+from hearts_solver import DoubleDummySolver
+
+
+def playout(hands, seat, trick, lead_suit, high_card, high_seat, trick_size, first_trick, hearts_broken, points,
+            rng):
+    """Plays the rest of a hand out with every player choosing a random legal card
+
+    Arguments:
+        hands: The hand mask of each seat, which is modified in place
+        seat: The seat that plays next
+        trick: The mask of cards played to the current trick so far
+        lead_suit: The suit led to the current trick, or None if the next card leads
+        high_card: The highest card of the lead suit in the current trick
+        high_seat: The seat that played high_card
+        trick_size: The number of cards played to the current trick so far
+        first_trick: Whether the current trick is the first of the hand
+        hearts_broken: Whether hearts have been broken
+        points: The penalty points each seat has taken so far, which is modified in place
+        rng: The random number generator used to choose cards
+
+    Returns:
+        list: The penalty points each seat ends the hand with, after accounting for shooting the moon
+    """
+    while hands[seat]:
+        card = random_card(legal_moves(hands[seat], lead_suit, first_trick, hearts_broken), rng)
+        hands[seat] ^= 1 << card
+        trick |= 1 << card
+        if lead_suit is None:
+            lead_suit = card // 13
+            high_card = card
+            high_seat = seat
+        elif card > high_card and card // 13 == lead_suit:
+            high_card = card
+            high_seat = seat
+        trick_size += 1
+        if trick_size == 4:
+            points[high_seat] += penalty_points(trick)
+            if trick & SUIT_MASKS[HEARTS]:
+                hearts_broken = True
+            seat = high_seat
+            trick = 0
+            lead_suit = None
+            trick_size = 0
+            first_trick = False
+        else:
+            seat = (seat + 1) % 4
+
+    # Shooting the moon gives every other player 26 points instead
+    for moon_seat in range(4):
+        if points[moon_seat] == 26:
+            return [0 if other == moon_seat else 26 for other in range(4)]
+    return points
+
+
+class MonteCarloComputer(Computer):
+    """A computer player that chooses cards by sampling the unseen cards and playing the hand out
+
+    Arguments:
+        name: The player's name.  If not given, one is taken from the name pool.
+        rng: The random number generator used for sampling
+        time_budget: The number of seconds to spend searching for each play, or None to always run max_rollouts.
+            With a time budget the plays depend on how fast the machine is, so anything that has to be reproducible
+            should use None.
+        max_rollouts: The most rollouts of each legal card to try for each play
+    """
+    def __init__(self, name=None, rng=random, time_budget=0.1, max_rollouts=5000):
+        super().__init__(name, rng)
+        self.time_budget = time_budget
+        self.max_rollouts = max_rollouts
+        self.last_rollouts = 0
+
+    def sample_hands(self, state, unseen_suits):
+        """Deals the unseen cards to the other players, agreeing with their known voids and the cards passed to them
+
+        Arguments:
+            state: The GameState of the decision
+            unseen_suits: The unseen cards that aren't known to be in a particular hand, as a list of (suit, cards)
+                pairs.  Suits that fewer players can hold come first, since dealing them first rarely dead-ends.
+
+        Returns:
+            list: The hand mask of each seat
+        """
+        hands = [0, 0, 0, 0]
+        hands[state.seat] = state.hand
+        hands[(state.seat + state.pass_num) % 4] |= state.passed & ~state.played
+        space = [held - hand.bit_count() for held, hand in zip(state.cards_held, hands)]
+        space[state.seat] = 0
+        voids = state.voids
+
+        for attempt in range(20):
+            dealt = [0, 0, 0, 0]
+            remaining = space[:]
+            for suit, cards in unseen_suits:
+                suit_bit = 1 << suit
+                self.rng.shuffle(cards)
+                for card in cards:
+                    seats = [seat for seat in range(4) if remaining[seat] and not voids[seat] & suit_bit]
+                    if not seats:
+                        break
+                    seat = seats[self.rng.randrange(len(seats))]
+                    dealt[seat] |= 1 << card
+                    remaining[seat] -= 1
+                else:
+                    continue
+                break
+            else:
+                return [hand | extra for hand, extra in zip(hands, dealt)]
+
+        # If the voids can't be satisfied, deals the cards ignoring them
+        cards = [card for suit, suit_cards in unseen_suits for card in suit_cards]
+        self.rng.shuffle(cards)
+        for seat in range(4):
+            for i in range(space[seat]):
+                hands[seat] |= 1 << cards.pop()
+        return hands
+
+    def search_setup(self, state):
+        """Works out what every search of a play starts from: the unseen cards, and who is winning the trick so far
+
+        Returns:
+            tuple: The unseen cards by suit as sample_hands takes them, the mask of the cards in the trick, and the
+                highest card of the lead suit in it (-1 if none) and the seat that played it
+        """
+        unseen = FULL_DECK & ~state.hand & ~state.played & ~state.passed
+        unseen_suits = [(suit, hand_cards(unseen & SUIT_MASKS[suit])) for suit in range(4)]
+        unseen_suits.sort(key=lambda suit_cards: sum(not void & (1 << suit_cards[0]) for void in state.voids))
+
+        trick = 0
+        high_card = -1
+        high_seat = state.seat
+        for position, card in enumerate(state.trick):
+            trick |= 1 << card
+            if card_suit(card) == state.lead_suit and card > high_card:
+                high_card = card
+                high_seat = (state.leader + position) % 4
+        return unseen_suits, trick, high_card, high_seat
+
+    def play_into_trick(self, state, card, high_card, high_seat):
+        """Returns the lead suit, the highest card of it and the seat that played it after the player plays a card"""
+        if state.lead_suit is None:
+            return card_suit(card), card, state.seat
+        if card > high_card and card_suit(card) == state.lead_suit:
+            return state.lead_suit, card, state.seat
+        return state.lead_suit, high_card, high_seat
+
+    def choose_card(self, state):
+        candidates = hand_cards(state.legal)
+        if len(candidates) == 1:
+            return candidates[0]
+
+        seat = state.seat
+        unseen_suits, trick, high_card, high_seat = self.search_setup(state)
+        trick_size = len(state.trick)
+
+        totals = [0] * len(candidates)
+        rollouts = 0
+        deadline = perf_counter() + self.time_budget if self.time_budget is not None else math.inf
+        next_seat = (seat + 1) % 4
+        while rollouts < self.max_rollouts and perf_counter() < deadline:
+            # Every candidate is tried on the same deal so that the comparison between them is fair
+            hands = self.sample_hands(state, unseen_suits)
+            for i, card in enumerate(candidates):
+                lead, new_high, new_high_seat = self.play_into_trick(state, card, high_card, high_seat)
+                sample = hands[:]
+                sample[seat] ^= 1 << card
+                new_trick = trick | 1 << card
+                points = list(state.points)
+                if trick_size == 3:
+                    points[new_high_seat] += penalty_points(new_trick)
+                    result = playout(sample, new_high_seat, 0, None, -1, new_high_seat, 0, False,
+                                     state.hearts_broken or bool(new_trick & SUIT_MASKS[HEARTS]), points, self.rng)
+                else:
+                    result = playout(sample, next_seat, new_trick, lead, new_high, new_high_seat, trick_size + 1,
+                                     state.first_trick, state.hearts_broken, points, self.rng)
+                totals[i] += result[seat]
+            rollouts += 1
+
+        self.last_rollouts = rollouts * len(candidates)
+        return candidates[totals.index(min(totals))]
+
+    def choose_pass(self, state):
+        # Passes the most dangerous cards: the high spades, then the highest cards of the shortest suits
+        def danger(card):
+            if (1 << card) & QUEEN_OF_SPADES or (card_suit(card) == SPADES and card_rank(card) > 12):
+                return 100 + card_rank(card)
+            suit_length = (state.hand & SUIT_MASKS[card_suit(card)]).bit_count()
+            return card_rank(card) * 2 - suit_length + (5 if card_suit(card) == HEARTS else 0)
+
+        cards_to_pass = 0
+        for card in sorted(hand_cards(state.hand), key=danger, reverse=True)[:3]:
+            cards_to_pass |= 1 << card
+        return cards_to_pass
+
+
+class DoubleDummyComputer(MonteCarloComputer):
+    """A computer player that plays like MonteCarloComputer until the endgame, then solves each sampled deal exactly
+    with the double-dummy solver instead of playing it out at random
+
+    The solver assumes the other players work together against it and ignores shooting the moon, and its search grows
+    quickly with the number of cards left, so it only takes over for the last few tricks.  One solver is shared by all
+    the samples of a play, so positions that come up in several deals are only searched once.
+
+    Arguments:
+        name: The player's name.  If not given, one is taken from the name pool.
+        rng: The random number generator used for sampling
+        time_budget: The time budget of MonteCarloComputer before the endgame
+        max_rollouts: The rollouts of MonteCarloComputer before the endgame
+        endgame_cards: The most cards left in hand at which the solver takes over
+        samples: The number of deals sampled and solved for each play in the endgame
+    """
+    def __init__(self, name=None, rng=random, time_budget=0.1, max_rollouts=5000, endgame_cards=5, samples=20):
+        super().__init__(name, rng, time_budget, max_rollouts)
+        self.endgame_cards = endgame_cards
+        self.samples = samples
+
+    def choose_card(self, state):
+        candidates = hand_cards(state.legal)
+        if len(candidates) == 1 or state.hand.bit_count() > self.endgame_cards:
+            return super().choose_card(state)
+
+        seat = state.seat
+        unseen_suits, trick, high_card, high_seat = self.search_setup(state)
+        trick_size = len(state.trick)
+
+        solver = DoubleDummySolver(seat)
+        totals = [0] * len(candidates)
+        for sample in range(self.samples):
+            hands = self.sample_hands(state, unseen_suits)
+            for i, card in enumerate(candidates):
+                lead, new_high, new_high_seat = self.play_into_trick(state, card, high_card, high_seat)
+                new_trick = trick | 1 << card
+                hands[seat] ^= 1 << card
+                if trick_size == 3:
+                    taken = penalty_points(new_trick) if new_high_seat == seat else 0
+                    totals[i] += taken + solver.find_score(hands, new_high_seat, 0, 0, None, -1, new_high_seat)
+                else:
+                    totals[i] += solver.find_score(hands, (seat + 1) % 4, new_trick, trick_size + 1, lead, new_high,
+                                                   new_high_seat)
+                hands[seat] ^= 1 << card
+        self.last_rollouts = self.samples * len(candidates)
+        return candidates[totals.index(min(totals))]
@@ -0,0 +1,211 @@
+"""
+Plays many hands of Hearts at once with NumPy, for collecting statistics much faster than looping over Player objects.
+
+Every hand in a batch is held in an array of 52-bit hand masks shaped (hands, seats), and each step of the game
+(dealing, passing and each of the 52 plays) is done for the whole batch with array operations.  Every player uses the
+same policy as hearts.Computer: a random legal card, and three random cards to pass.
+
+    python hearts_batch.py --hands 1000000 --batch-size 100000 --seed 1
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from hearts import FULL_DECK, HEARTS, PENALTY_CARDS, QUEEN_OF_SPADES, SUIT_MASKS, TWO_OF_CLUBS
+
+# Hands are stored as 52-bit masks in the same layout as hearts.py, held in unsigned 64-bit arrays
+SUIT_MASK_ARRAY = np.array(SUIT_MASKS, dtype=np.uint64)
+NON_HEARTS = np.uint64(FULL_DECK & ~SUIT_MASKS[HEARTS])
+NON_PENALTY = np.uint64(FULL_DECK & ~PENALTY_CARDS)
+CARD_BITS = np.left_shift(np.uint64(1), np.arange(52, dtype=np.uint64))
+
+# Lookup tables indexed by card number
+CARD_SUITS = np.arange(52) // 13
+HEART_CARDS = CARD_SUITS == HEARTS
+CARD_PENALTIES = HEART_CARDS.astype(np.int64)
+CARD_PENALTIES[QUEEN_OF_SPADES.bit_length() - 1] = 13
+
+# Lookup tables indexed by a byte of a hand mask: the number of cards in it, and the position of its nth card
+BYTE_COUNTS = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+BYTE_SELECT = np.zeros((256, 8), dtype=np.uint8)
+for byte in range(256):
+    for n, bit in enumerate(bit for bit in range(8) if byte >> bit & 1):
+        BYTE_SELECT[byte, n] = bit
+
+
+def random_cards(masks, rng):
+    """Picks a random card from each mask in an array of hand masks
+
+    Each mask is split into its 8 bytes, the number of cards in each byte is looked up, and a running count of those
+    finds the byte holding the chosen card, so only 8 values per mask are touched instead of 52.
+
+    Arguments:
+        masks: A 1-dimensional array of nonzero hand masks
+        rng: A numpy.random.Generator
+
+    Returns:
+        numpy.ndarray: The chosen card from each mask
+    """
+    index = np.arange(len(masks))
+    mask_bytes = masks.view(np.uint8).reshape(-1, 8)
+    if not np.little_endian:
+        mask_bytes = mask_bytes[:, ::-1]
+    counts = BYTE_COUNTS[mask_bytes]
+    running_counts = np.cumsum(counts, axis=1, dtype=np.int8)
+    choice = (rng.random(len(masks)) * running_counts[:, -1]).astype(np.int8)
+    chosen_byte = np.argmax(running_counts > choice[:, None], axis=1)
+    nth = choice - running_counts[index, chosen_byte] + counts[index, chosen_byte]
+    return chosen_byte * 8 + BYTE_SELECT[mask_bytes[index, chosen_byte], nth]
+
+
+def deal_cards(num_hands, rng):
+    """Shuffles and deals a batch of hands
+
+    Arguments:
+        num_hands: The number of hands to deal
+        rng: A numpy.random.Generator
+
+    Returns:
+        numpy.ndarray: The hand mask of each seat, shaped (hands, seats)
+    """
+    deck = np.argsort(rng.random((num_hands, 52)), axis=1)
+    return CARD_BITS[deck].reshape(num_hands, 4, 13).sum(axis=2, dtype=np.uint64)
+
+
+def pass_cards(hands, pass_num, rng):
+    """Has every seat pass three random cards, modifying the batch in place
+
+    Arguments:
+        hands: The batch of hands, as returned by deal_cards
+        pass_num: The number of seats to the left to pass to, which is 0 on a hold hand
+        rng: A numpy.random.Generator
+
+    Returns:
+        numpy.ndarray: The mask of the cards each seat passed, shaped (hands, seats)
+    """
+    if pass_num == 0:
+        return np.zeros_like(hands)
+    flat_hands = hands.reshape(-1)
+    passing = np.zeros_like(flat_hands)
+    for i in range(3):
+        card_bits = CARD_BITS[random_cards(flat_hands, rng)]
+        flat_hands ^= card_bits
+        passing |= card_bits
+    passing = passing.reshape(hands.shape)
+    hands |= np.roll(passing, pass_num, axis=1)
+    return passing
+
+
+def play_trick(hands, leader, hearts_broken, first_trick, rng):
+    """Plays one trick of every hand in the batch, modifying the hands in place
+
+    Arguments:
+        hands: The batch of hands, as returned by deal_cards
+        leader: The seat leading the trick in each hand
+        hearts_broken: Whether hearts are broken in each hand
+        first_trick: Whether this is the first trick of the hands
+        rng: A numpy.random.Generator
+
+    Returns:
+        tuple: The seat that won the trick in each hand, the penalty points in each trick, and whether each trick
+            contained a heart
+    """
+    num_hands = len(leader)
+    hand_index = np.arange(num_hands)
+    trick = np.zeros((num_hands, 4), dtype=np.int64)
+    for position in range(4):
+        seat = (leader + position) % 4
+        hand = hands[hand_index, seat]
+        if position == 0:
+            # The 2 of Clubs must be led, and hearts can't be led until broken unless there is nothing else
+            if first_trick:
+                card = np.zeros(num_hands, dtype=np.int64)
+            else:
+                non_hearts = hand & NON_HEARTS
+                card = random_cards(np.where(~hearts_broken & (non_hearts != 0), non_hearts, hand), rng)
+            lead_suit = card // 13
+            lead_suit_mask = SUIT_MASK_ARRAY[lead_suit]
+        else:
+            # Players must follow suit, and can't play penalty cards on the first trick unless there is nothing else
+            following = hand & lead_suit_mask
+            legal = np.where(following != 0, following, hand)
+            if first_trick:
+                safe = legal & NON_PENALTY
+                legal = np.where(safe != 0, safe, legal)
+            card = random_cards(legal, rng)
+        hands[hand_index, seat] = hand ^ CARD_BITS[card]
+        trick[hand_index, seat] = card
+
+    # The highest card of the lead suit wins
+    winner = np.argmax(np.where(CARD_SUITS[trick] == lead_suit[:, None], trick, -1), axis=1)
+    return winner, CARD_PENALTIES[trick].sum(axis=1), HEART_CARDS[trick].any(axis=1)
+
+
+def play_hands(num_hands, pass_num=0, rng=None):
+    """Deals and plays a batch of hands
+
+    Arguments:
+        num_hands: The number of hands to play
+        pass_num: The number of seats to the left each seat passes to, which is 0 on a hold hand
+        rng: A numpy.random.Generator.  Defaults to a new unseeded generator.
+
+    Returns:
+        numpy.ndarray: The penalty points each seat is given in each hand, shaped (hands, seats), after accounting for
+            shooting the moon
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    hands = deal_cards(num_hands, rng)
+    pass_cards(hands, pass_num, rng)
+    return play_out(hands, rng)
+
+
+def play_out(hands, rng):
+    """Plays all 13 tricks of a batch of hands that have already been dealt and passed
+
+    Arguments:
+        hands: The batch of hands, which is emptied as the cards are played
+        rng: A numpy.random.Generator
+
+    Returns:
+        numpy.ndarray: The penalty points each seat is given in each hand, shaped (hands, seats), after accounting for
+            shooting the moon
+    """
+    num_hands = len(hands)
+    hand_index = np.arange(num_hands)
+    leader = np.argmax(hands & np.uint64(TWO_OF_CLUBS) != 0, axis=1)
+    hearts_broken = np.zeros(num_hands, dtype=bool)
+    points = np.zeros((num_hands, 4), dtype=np.int64)
+    for trick_num in range(13):
+        leader, trick_points, trick_hearts = play_trick(hands, leader, hearts_broken, trick_num == 0, rng)
+        points[hand_index, leader] += trick_points
+        hearts_broken |= trick_hearts
+
+    # Shooting the moon gives every other seat 26 points instead
+    shot_moon = (points == 26).any(axis=1)
+    points[shot_moon] = 26 - points[shot_moon]
+    return points
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play a large batch of random Hearts hands with NumPy.")
+    parser.add_argument("--hands", type=int, default=1000000, help="number of hands to play")
+    parser.add_argument("--batch-size", type=int, default=100000, help="number of hands played at once")
+    parser.add_argument("--seed", type=int, help="seed for the random number generator")
+    args = parser.parse_args()
+
+    generator = np.random.default_rng(args.seed)
+    totals = np.zeros(4, dtype=np.int64)
+    moons = 0
+    start_time = perf_counter()
+    for batch_start in range(0, args.hands, args.batch_size):
+        batch_size = min(args.batch_size, args.hands - batch_start)
+        # Rotates the pass direction between batches the same way a game does between hands
+        penalties = play_hands(batch_size, [0, 1, 3, 2][(batch_start // args.batch_size + 1) % 4], generator)
+        totals += penalties.sum(axis=0)
+        moons += int(((penalties == 26).sum(axis=1) == 3).sum())
+    elapsed = perf_counter() - start_time
+    print(f"Played {args.hands:,} hands in {elapsed:.2f}s ({args.hands / elapsed:,.0f} hands per second)")
+    print("Average penalty by seat: " + ", ".join(f"{total / args.hands:.2f}" for total in totals))
+    print(f"Moons shot: {moons / args.hands:.3%} of hands")
@@ -0,0 +1,209 @@
+"""
+A compact binary log of Hearts games, for recording and mining large numbers of headless self-play games.
+
+A log file starts with a 5-byte header and is followed by fixed-size records, each starting with a 1-byte type:
+
+    DEAL      pass number (0 = hold, 1 = left, 2 = across, 3 = right), then each seat's 13 cards    54 bytes
+    PASS      the 3 cards each seat received                                                         13 bytes
+    TRICK     the leading seat, the card played by each seat, then the winning seat                  7 bytes
+    HAND_END  the penalty points given to each seat, after shooting the moon                         5 bytes
+    GAME_END  each seat's final score, as 16-bit integers                                            9 bytes
+
+Cards are stored as their card numbers from hearts.py, so a full hand takes about 170 bytes.  The reader works through
+the file in large chunks and yields one record, hand or game at a time, so logs far bigger than memory can be replayed
+or aggregated.
+
+    python hearts.py --simulate 10000 --seed 1 --log games.hlog
+    python hearts_log.py games.hlog
+"""
+
+import argparse
+import struct
+from collections import Counter
+
+from hearts import QUEEN_OF_SPADES, hand_cards
+
+MAGIC = b"HRTL\x01"
+
+DEAL, PASS, TRICK, HAND_END, GAME_END = range(1, 6)
+RECORD_SIZES = {DEAL: 54, PASS: 13, TRICK: 7, HAND_END: 5, GAME_END: 9}
+GAME_END_FORMAT = struct.Struct("<B4H")
+
+
+class GameLogWriter:
+    """Writes games to a binary log.  An instance is passed to hearts.play_game as its log argument.
+
+    Arguments:
+        path: The file to write the log to
+        buffer_size: The number of bytes to collect before writing them to the file
+    """
+    def __init__(self, path, buffer_size=1 << 20):
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.buffer = bytearray()
+        self.buffer_size = buffer_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def deal(self, pass_num, hands):
+        self.buffer.append(DEAL)
+        self.buffer.append(pass_num)
+        for hand in hands:
+            self.buffer.extend(hand_cards(hand))
+
+    def passes(self, incoming_cards):
+        self.buffer.append(PASS)
+        for cards in incoming_cards:
+            self.buffer.extend(hand_cards(cards))
+
+    def trick(self, leader, cards, winner):
+        self.buffer.append(TRICK)
+        self.buffer.append(leader)
+        self.buffer.extend(cards)
+        self.buffer.append(winner)
+
+    def hand_end(self, penalties):
+        self.buffer.append(HAND_END)
+        self.buffer.extend(penalties)
+
+    def game_end(self, scores):
+        self.buffer.extend(GAME_END_FORMAT.pack(GAME_END, *scores))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+
+def read_records(path, chunk_size=1 << 20):
+    """Reads a game log one record at a time
+
+    Arguments:
+        path: The log file to read
+        chunk_size: The number of bytes to read from the file at a time
+
+    Yields:
+        tuple: The record type and its fields.  DEAL records give (DEAL, pass_num, hands), where hands holds a tuple of
+            13 cards for each seat; PASS records give (PASS, cards), with the 3 cards received by each seat; TRICK
+            records give (TRICK, leader, cards, winner), with the card played by each seat; HAND_END records give
+            (HAND_END, penalties); and GAME_END records give (GAME_END, scores).
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Hearts game log")
+        data = b""
+        position = 0
+        # The offset in the file of the start of data
+        data_offset = len(MAGIC)
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            data_offset += position
+            data = data[position:] + chunk
+            position = 0
+            end = len(data)
+            while position < end:
+                record_type = data[position]
+                size = RECORD_SIZES.get(record_type)
+                if size is None:
+                    raise ValueError(f"{path} has an unknown record type {record_type} at byte "
+                                     f"{data_offset + position}")
+                if position + size > end:
+                    break
+                if record_type == TRICK:
+                    yield TRICK, data[position + 1], tuple(data[position + 2:position + 6]), data[position + 6]
+                elif record_type == DEAL:
+                    start = position + 2
+                    yield DEAL, data[position + 1], tuple(tuple(data[start + seat * 13:start + seat * 13 + 13])
+                                                          for seat in range(4))
+                elif record_type == PASS:
+                    yield PASS, tuple(tuple(data[position + 1 + seat * 3:position + 4 + seat * 3]) for seat in range(4))
+                elif record_type == HAND_END:
+                    yield HAND_END, tuple(data[position + 1:position + 5])
+                else:
+                    yield GAME_END, GAME_END_FORMAT.unpack_from(data, position)[1:]
+                position += size
+        if data[position:]:
+            raise ValueError(f"{path} ends partway through a record")
+
+
+def read_hands(path):
+    """Reads a game log one hand at a time
+
+    Arguments:
+        path: The log file to read
+
+    Yields:
+        dict: The hand's pass number, the dealt hands, the cards each seat received in the pass (or None on a hold
+            hand), the tricks as (leader, cards, winner) tuples, and the penalty points given to each seat
+    """
+    for record in read_records(path):
+        record_type = record[0]
+        if record_type == TRICK:
+            hand["tricks"].append(record[1:])
+        elif record_type == DEAL:
+            hand = {"pass_num": record[1], "deal": record[2], "passes": None, "tricks": []}
+        elif record_type == PASS:
+            hand["passes"] = record[1]
+        elif record_type == HAND_END:
+            hand["penalties"] = record[1]
+            yield hand
+
+
+def summarize(path):
+    """Aggregates hand statistics from a game log without loading it into memory
+
+    Arguments:
+        path: The log file to read
+
+    Returns:
+        dict: The number of games and hands, the average penalty of each seat, how often each seat shot the moon, and
+            how often the Queen of Spades was won by the seat that led the trick it fell on
+    """
+    queen_card = QUEEN_OF_SPADES.bit_length() - 1
+    games = hands = queen_tricks = queen_to_leader = 0
+    penalty_totals = [0, 0, 0, 0]
+    moons = Counter()
+    for record in read_records(path):
+        record_type = record[0]
+        if record_type == TRICK:
+            if queen_card in record[2]:
+                queen_tricks += 1
+                queen_to_leader += record[1] == record[3]
+        elif record_type == HAND_END:
+            hands += 1
+            for seat, penalty in enumerate(record[1]):
+                penalty_totals[seat] += penalty
+            if sorted(record[1]) == [0, 26, 26, 26]:
+                moons[record[1].index(0)] += 1
+        elif record_type == GAME_END:
+            games += 1
+    return {
+        "games": games,
+        "hands": hands,
+        "average_penalties": [total / hands for total in penalty_totals] if hands else [0, 0, 0, 0],
+        "moons": [moons[seat] for seat in range(4)],
+        "queen_to_leader": queen_to_leader / queen_tricks if queen_tricks else 0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a binary Hearts game log.")
+    parser.add_argument("path", help="the log file to read")
+    args = parser.parse_args()
+
+    summary = summarize(args.path)
+    print(f"{summary['games']} games, {summary['hands']} hands")
+    print("Average penalty by seat: " + ", ".join(f"{penalty:.2f}" for penalty in summary["average_penalties"]))
+    print("Moons shot by seat: " + ", ".join(str(moons) for moons in summary["moons"]))
+    print(f"Queen of Spades won by the trick's leader: {summary['queen_to_leader']:.1%}")
@@ -0,0 +1,233 @@
+"""
+Chooses which three cards to pass in Hearts by scoring every one of the 286 possible passes.
+
+Each pass is scored by the penalty points the hand it leaves behind is expected to take.  The expectations come from
+tables built offline from a large number of self-play hands (played with hearts_batch), which record the average
+penalty of a hand by the holding pattern of each of its suits after the pass: the number of cards kept in the suit
+(counting 8 or more together), and which of its Queen, King and Ace are kept.  A hand's expected penalty is the
+average penalty of all hands plus how far each of its four suit patterns moves that average.
+
+The tables are built once, cached in a JSON file next to this module, and expanded into a lookup index with an entry
+for every possible holding of each suit, so scoring a pass is four list lookups and choosing one takes well under a
+millisecond.
+
+    python hearts_pass.py --build --hands 300000 --seed 0
+    python hearts_pass.py --hand "AS QS 3S KH 9H 2H AD 5D 4D 7C 6C 3C 2C" --pass-num 1
+"""
+
+import argparse
+import json
+import os
+import random
+from itertools import combinations
+from time import perf_counter
+
+import numpy as np
+
+import hearts_batch
+from hearts import Computer, get_card_name, hand_cards, make_card
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hearts_pass_tables.json")
+
+# Suits with 8 or more cards kept are counted together, and the top three ranks of each suit are tracked, giving 72
+# patterns per suit
+MAX_LENGTH = 8
+NUM_PATTERNS = (MAX_LENGTH + 1) * 8
+
+# The version of the table format and build, so tables cached by an older build are rebuilt
+TABLE_VERSION = 2
+
+# How many hands' worth of weight a pattern's average is pulled toward the overall average with, so that rare
+# patterns seen in only a few hands don't get extreme values
+PRIOR_WEIGHT = 100
+
+# The pattern of every possible 13-bit holding of a suit
+HOLDING_PATTERNS = [min(holding.bit_count(), MAX_LENGTH) * 8 + (holding >> 10) for holding in range(1 << 13)]
+
+# The lookup indexes built from each table file, so each is only loaded once per process
+loaded_evaluators = {}
+
+
+def holding_patterns(hands, suit):
+    """Finds the holding pattern of one suit in each hand of an array of hand masks"""
+    holdings = (hands >> np.uint64(13 * suit)) & np.uint64(0x1FFF)
+    lengths = hearts_batch.BYTE_COUNTS[holdings & np.uint64(0xFF)] + hearts_batch.BYTE_COUNTS[holdings >> np.uint64(8)]
+    return (np.minimum(lengths, MAX_LENGTH).astype(np.int64) * 8 + (holdings >> np.uint64(10)).astype(np.int64))
+
+
+def build_tables(num_hands=300000, seed=0, batch_size=100000):
+    """Plays self-play hands with random passes and records the penalty taken by each suit holding pattern
+
+    Arguments:
+        num_hands: The number of hands to play for each of the three pass directions
+        seed: Seeds the numpy random number generator, so the same seed always builds the same tables
+        batch_size: The number of hands played at once
+
+    Returns:
+        dict: The build parameters, and for each pass number (with the hold hand left empty) and suit, the number of
+            hands that kept each pattern and the total penalty points those hands took
+    """
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((4, 4, NUM_PATTERNS), dtype=np.int64)
+    sums = np.zeros((4, 4, NUM_PATTERNS), dtype=np.int64)
+    for pass_num in range(1, 4):
+        for batch_start in range(0, num_hands, batch_size):
+            hands = hearts_batch.deal_cards(min(batch_size, num_hands - batch_start), rng)
+            dealt = hands.copy()
+            # pass_cards swaps the passed cards for the received ones in place, so the kept cards are what was dealt
+            # less what was passed
+            kept = dealt ^ hearts_batch.pass_cards(hands, pass_num, rng)
+            kept_bytes = hearts_batch.BYTE_COUNTS[kept.view(np.uint8)].reshape(kept.shape + (8,))
+            if not (kept_bytes.sum(axis=-1) == 10).all():
+                raise ValueError("every hand should keep 10 cards after passing")
+            penalties = hearts_batch.play_out(hands, rng).reshape(-1)
+            kept = kept.reshape(-1)
+            for suit in range(4):
+                patterns = holding_patterns(kept, suit)
+                counts[pass_num, suit] += np.bincount(patterns, minlength=NUM_PATTERNS)
+                totals = np.bincount(patterns, weights=penalties, minlength=NUM_PATTERNS)
+                sums[pass_num, suit] += totals.astype(np.int64)
+    return {"version": TABLE_VERSION, "hands": num_hands, "seed": seed, "counts": counts.tolist(),
+            "sums": sums.tolist()}
+
+
+def load_tables(path=DEFAULT_TABLE_PATH, num_hands=None, seed=None):
+    """Reads the tables from their cache file, building and saving them first if the file is missing, is from an
+    older version of build_tables, or was built with different parameters than those given
+
+    Arguments:
+        path: The cache file
+        num_hands: The number of hands to build the tables from for each pass direction.  If not given, tables built
+            from any number of hands are used, and missing tables are built from 300000.
+        seed: The seed to build the tables with.  If not given, tables built with any seed are used, and missing
+            tables are built with seed 0.
+
+    Returns:
+        dict: The tables, as returned by build_tables
+    """
+    if os.path.exists(path):
+        with open(path) as file:
+            tables = json.load(file)
+        if (tables.get("version") == TABLE_VERSION and num_hands in (None, tables["hands"])
+                and seed in (None, tables["seed"])):
+            return tables
+    tables = build_tables(300000 if num_hands is None else num_hands, 0 if seed is None else seed)
+    # Writes to a temporary file first so that other processes never read a partly written cache
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(tables, file)
+    os.replace(temp_path, path)
+    return tables
+
+
+class PassEvaluator:
+    """Scores passes with a lookup index built from the penalty tables
+
+    Arguments:
+        tables: The tables, as returned by build_tables or load_tables
+    """
+    def __init__(self, tables):
+        # For each pass number and suit, the amount each possible 13-bit holding moves the expected penalty by
+        self.index = [None]
+        self.average = [0.0]
+        for pass_num in range(1, 4):
+            counts = tables["counts"][pass_num]
+            sums = tables["sums"][pass_num]
+            average = sum(sums[0]) / sum(counts[0])
+            suit_indexes = []
+            for suit in range(4):
+                adjustments = [(total + PRIOR_WEIGHT * average) / (count + PRIOR_WEIGHT) - average
+                               for count, total in zip(counts[suit], sums[suit])]
+                suit_indexes.append([adjustments[pattern] for pattern in HOLDING_PATTERNS])
+            self.index.append(suit_indexes)
+            self.average.append(average)
+
+    def expected_penalty(self, kept, pass_num):
+        """Returns the expected penalty points of a hand after passing
+
+        Arguments:
+            kept: The mask of the cards kept
+            pass_num: The number of seats to the left the cards are passed to
+        """
+        clubs, spades, hearts, diamonds = self.index[pass_num]
+        return (self.average[pass_num] + clubs[kept & 0x1FFF] + spades[kept >> 13 & 0x1FFF]
+                + hearts[kept >> 26 & 0x1FFF] + diamonds[kept >> 39])
+
+    def score_passes(self, hand, pass_num):
+        """Scores every possible pass from a hand
+
+        Arguments:
+            hand: The hand mask before passing
+            pass_num: The number of seats to the left the cards are passed to
+
+        Returns:
+            list: A (expected penalty, pass mask) pair for each of the possible passes, best first
+        """
+        clubs, spades, hearts, diamonds = self.index[pass_num]
+        average = self.average[pass_num]
+        scores = []
+        for first, second, third in combinations([1 << card for card in hand_cards(hand)], 3):
+            passed = first | second | third
+            kept = hand ^ passed
+            scores.append((average + clubs[kept & 0x1FFF] + spades[kept >> 13 & 0x1FFF]
+                           + hearts[kept >> 26 & 0x1FFF] + diamonds[kept >> 39], passed))
+        scores.sort()
+        return scores
+
+    def best_pass(self, hand, pass_num):
+        """Returns the mask of the three cards whose pass leaves the hand with the lowest expected penalty"""
+        return self.score_passes(hand, pass_num)[0][1]
+
+
+def load_evaluator(path=DEFAULT_TABLE_PATH):
+    """Returns the PassEvaluator for a table file, loading it only the first time it is asked for in each process"""
+    if path not in loaded_evaluators:
+        loaded_evaluators[path] = PassEvaluator(load_tables(path))
+    return loaded_evaluators[path]
+
+
+class PassEvaluatorComputer(Computer):
+    """A computer player that passes the three cards leaving the lowest expected penalty, and plays like Computer
+
+    Arguments:
+        name: The player's name.  If not given, one is taken from the name pool.
+        rng: The random number generator used to choose cards
+        evaluator: The PassEvaluator to use.  Defaults to the one built from the default table file.
+    """
+    def __init__(self, name=None, rng=random, evaluator=None):
+        super().__init__(name, rng)
+        self.evaluator = evaluator if evaluator is not None else load_evaluator()
+
+    def choose_pass(self, state):
+        return self.evaluator.best_pass(state.hand, state.pass_num)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the Hearts pass tables, or score the passes from a hand.")
+    parser.add_argument("--build", action="store_true", help="rebuild the tables even if they are cached")
+    parser.add_argument("--hands", type=int,
+                        help="number of self-play hands per pass direction (default: any cached tables, or 300000)")
+    parser.add_argument("--seed", type=int, help="seed for building the tables (default: any cached tables, or 0)")
+    parser.add_argument("--path", default=DEFAULT_TABLE_PATH, help="the table cache file")
+    parser.add_argument("--hand", help="13 cards to score the passes of, such as \"AS QS 3S KH ...\"")
+    parser.add_argument("--pass-num", type=int, default=1, choices=[1, 2, 3],
+                        help="number of seats to the left to pass to")
+    args = parser.parse_args()
+
+    if args.build and os.path.exists(args.path):
+        os.remove(args.path)
+    start_time = perf_counter()
+    evaluator = PassEvaluator(load_tables(args.path, args.hands, args.seed))
+    print(f"Loaded the pass tables in {perf_counter() - start_time:.2f}s")
+
+    if args.hand:
+        hand = 0
+        for name in args.hand.split():
+            rank = {"J": 11, "Q": 12, "K": 13, "A": 14}.get(name[:-1]) or int(name[:-1])
+            hand |= 1 << make_card(rank, name[-1].upper())
+        start_time = perf_counter()
+        scores = evaluator.score_passes(hand, args.pass_num)
+        elapsed = perf_counter() - start_time
+        print(f"Scored {len(scores)} passes in {elapsed * 1000:.3f} ms")
+        for score, passed in scores[:5]:
+            print(f"{score:6.2f}  " + " ".join(get_card_name(card) for card in hand_cards(passed)))
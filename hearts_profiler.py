@@ -0,0 +1,129 @@
+"""
+Measures how long each Hearts player takes to make its decisions, to catch slow computer players before they reach
+interactive play.
+
+A DecisionProfiler is passed to hearts.play_game, which hands it every choose_card and choose_pass call.  It times each
+call and, if asked, records the peak memory allocated during it, keeping the samples for each player type and
+decision separately.  The report gives the median, 90th and 99th percentile and worst latency of each.
+
+    python hearts_profiler.py --games 20 --seed 1 --seats montecarlo computer computer computer --budget-ms 150
+"""
+
+import argparse
+import math
+import sys
+import tracemalloc
+from collections import defaultdict
+from time import perf_counter_ns
+
+import hearts
+from hearts_tournament import PLAYER_TYPES
+
+
+def percentile(sorted_values, fraction):
+    """Returns the value below which the given fraction of a sorted list falls, using the nearest-rank method"""
+    return sorted_values[max(math.ceil(len(sorted_values) * fraction) - 1, 0)]
+
+
+class DecisionProfiler:
+    """Records the latency and memory cost of every decision made by the players in a game
+
+    Arguments:
+        track_memory: Whether to record the peak memory allocated during each decision.  This uses tracemalloc, which
+            slows every decision down considerably, so latencies measured with it on are only useful relative to
+            each other.
+    """
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.latencies = defaultdict(list)
+        self.memory_peaks = defaultdict(list)
+
+    def measure(self, player, decision, state):
+        """Asks a player for a decision and records how long it took
+
+        Arguments:
+            player: The player making the decision
+            decision: The name of the method to call, either "choose_card" or "choose_pass"
+            state: The hearts.GameState passed to the method
+
+        Returns:
+            The player's decision
+        """
+        key = (type(player).__name__, decision)
+        method = getattr(player, decision)
+        if self.track_memory:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+            start_time = perf_counter_ns()
+            result = method(state)
+            elapsed = perf_counter_ns() - start_time
+            self.memory_peaks[key].append(tracemalloc.get_traced_memory()[1] - start_memory)
+            if started_tracing:
+                tracemalloc.stop()
+        else:
+            start_time = perf_counter_ns()
+            result = method(state)
+            elapsed = perf_counter_ns() - start_time
+        self.latencies[key].append(elapsed)
+        return result
+
+    def report(self):
+        """Summarizes the recorded decisions
+
+        Returns:
+            list: A dict for each player type and decision, giving the number of decisions, the mean, median, 90th
+                and 99th percentile and worst latency in milliseconds, and the worst peak memory in bytes (or None if
+                memory wasn't tracked)
+        """
+        rows = []
+        for (player_type, decision), samples in sorted(self.latencies.items()):
+            latencies = sorted(samples)
+            peaks = self.memory_peaks.get((player_type, decision))
+            rows.append({
+                "player": player_type,
+                "decision": decision,
+                "count": len(latencies),
+                "mean_ms": sum(latencies) / len(latencies) / 1e6,
+                "p50_ms": percentile(latencies, 0.5) / 1e6,
+                "p90_ms": percentile(latencies, 0.9) / 1e6,
+                "p99_ms": percentile(latencies, 0.99) / 1e6,
+                "max_ms": latencies[-1] / 1e6,
+                "max_memory": max(peaks) if peaks else None,
+            })
+        return rows
+
+    def print_report(self):
+        """Prints the latency percentiles of each player type and decision"""
+        print("{:<24}{:<13}{:>9}{:>11}{:>11}{:>11}{:>11}{:>11}{:>13}".format(
+            "Player", "Decision", "Count", "Mean ms", "p50 ms", "p90 ms", "p99 ms", "Max ms", "Peak memory"))
+        for row in self.report():
+            memory = f"{row['max_memory'] / 1024:,.1f} KiB" if row["max_memory"] is not None else "-"
+            print("{:<24}{:<13}{:>9}{:>11.3f}{:>11.3f}{:>11.3f}{:>11.3f}{:>11.3f}{:>13}".format(
+                row["player"], row["decision"], row["count"], row["mean_ms"], row["p50_ms"], row["p90_ms"],
+                row["p99_ms"], row["max_ms"], memory))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the decisions of Hearts players in headless games.")
+    parser.add_argument("--games", type=int, default=10, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--seats", nargs=4, default=["computer"] * 4, choices=sorted(PLAYER_TYPES),
+                        help="player type for each of the four seats")
+    parser.add_argument("--memory", action="store_true", help="also record the peak memory of each decision")
+    parser.add_argument("--budget-ms", type=float,
+                        help="exit with an error if any player's 99th percentile latency is above this")
+    args = parser.parse_args()
+
+    profiler = DecisionProfiler(track_memory=args.memory)
+    hearts.simulate_games(args.games, args.seed, [PLAYER_TYPES[seat] for seat in args.seats], profiler=profiler)
+    profiler.print_report()
+
+    if args.budget_ms is not None:
+        too_slow = [row for row in profiler.report() if row["p99_ms"] > args.budget_ms]
+        for row in too_slow:
+            print(f"{row['player']}.{row['decision']} is over budget: p99 {row['p99_ms']:.3f} ms > "
+                  f"{args.budget_ms} ms", file=sys.stderr)
+        sys.exit(1 if too_slow else 0)
@@ -0,0 +1,177 @@
+"""
+Runs large tournaments of headless Hearts games to compare computer player strategies.
+
+Each game is played with its own seed, drawn in order from a master seed, and the games are spread across a pool of
+worker processes.  Every statistic is merged from integer counts, so a given master seed always produces the same
+report no matter how many workers are used.
+
+    python hearts_tournament.py --games 100000 --seed 1 --workers 8 --seats computer computer computer computer
+"""
+
+import argparse
+import functools
+import math
+import random
+from collections import Counter
+from multiprocessing import Pool
+from time import perf_counter
+
+import hearts
+import hearts_ai
+import hearts_pass
+
+# The number of rollouts of each card the Monte Carlo player tries per play, about what its default time budget allows.
+# Tournament players don't use a time budget, so the results don't depend on how fast or busy the workers are.
+MONTE_CARLO_ROLLOUTS = 500
+
+# The player classes that can be seated by name
+PLAYER_TYPES = {
+    "computer": hearts.Computer,
+    "montecarlo": functools.partial(hearts_ai.MonteCarloComputer, time_budget=None,
+                                    max_rollouts=MONTE_CARLO_ROLLOUTS),
+    "passeval": hearts_pass.PassEvaluatorComputer,
+    "doubledummy": functools.partial(hearts_ai.DoubleDummyComputer, time_budget=None,
+                                     max_rollouts=MONTE_CARLO_ROLLOUTS),
+}
+
+# The z-score for a 95% confidence interval
+Z_95 = 1.959963984540054
+
+
+def game_seeds(num_games, seed):
+    """Draws the seed for each game from the master seed"""
+    master_rng = random.Random(seed)
+    return [master_rng.getrandbits(64) for i in range(num_games)]
+
+
+def new_summary():
+    """Returns an empty tournament summary, which holds integer counts for each seat"""
+    return {
+        "games": 0,
+        "hands": 0,
+        "wins": [0, 0, 0, 0],
+        "moons": [0, 0, 0, 0],
+        "score_sum": [0, 0, 0, 0],
+        "score_square_sum": [0, 0, 0, 0],
+        "scores": [Counter() for seat in range(4)],
+        "hand_penalties": [Counter() for seat in range(4)],
+    }
+
+
+def merge_summaries(summary, other):
+    """Adds the counts in other to summary"""
+    summary["games"] += other["games"]
+    summary["hands"] += other["hands"]
+    for seat in range(4):
+        summary["wins"][seat] += other["wins"][seat]
+        summary["moons"][seat] += other["moons"][seat]
+        summary["score_sum"][seat] += other["score_sum"][seat]
+        summary["score_square_sum"][seat] += other["score_square_sum"][seat]
+        summary["scores"][seat].update(other["scores"][seat])
+        summary["hand_penalties"][seat].update(other["hand_penalties"][seat])
+    return summary
+
+
+def play_games(seats, seeds):
+    """Plays one game for each seed and summarizes the results.  This is the work done by each worker process.
+
+    Arguments:
+        seats: The names of the player types for the four seats
+        seeds: The seeds of the games to play
+
+    Returns:
+        dict: The summary of the games
+    """
+    player_types = [PLAYER_TYPES[seat] for seat in seats]
+    summary = new_summary()
+    for seed in seeds:
+        result = hearts.play_headless_game(seed, player_types)
+        summary["games"] += 1
+        summary["hands"] += len(result["hands"])
+        summary["wins"][result["winner"]] += 1
+        for seat, score in enumerate(result["scores"]):
+            summary["score_sum"][seat] += score
+            summary["score_square_sum"][seat] += score * score
+            summary["scores"][seat][score] += 1
+        for hand in result["hands"]:
+            if hand["shot_moon"] is not None:
+                summary["moons"][hand["shot_moon"]] += 1
+            for seat, penalty in enumerate(hand["penalties"]):
+                summary["hand_penalties"][seat][penalty] += 1
+    return summary
+
+
+def run_tournament(num_games, seats=("computer",) * 4, seed=None, workers=None, chunk_size=250):
+    """Plays a tournament across a pool of worker processes
+
+    Arguments:
+        num_games: The number of games to play
+        seats: The names of the player types for the four seats
+        seed: The master seed.  The results only depend on this, not on the number of workers.
+        workers: The number of worker processes.  Defaults to one per CPU, and 1 plays every game in this process.
+        chunk_size: The number of games sent to a worker at a time
+
+    Returns:
+        dict: The merged summary of every game
+    """
+    seeds = game_seeds(num_games, seed)
+    chunks = [seeds[i:i + chunk_size] for i in range(0, num_games, chunk_size)]
+    summary = new_summary()
+    if workers == 1:
+        for chunk in chunks:
+            merge_summaries(summary, play_games(seats, chunk))
+    else:
+        with Pool(workers) as pool:
+            for chunk_summary in pool.starmap(play_games, [(seats, chunk) for chunk in chunks]):
+                merge_summaries(summary, chunk_summary)
+    return summary
+
+
+def mean_interval(total, square_total, n):
+    """Returns the mean and the half-width of its 95% confidence interval"""
+    mean = total / n
+    variance = max(square_total / n - mean * mean, 0) * n / (n - 1) if n > 1 else 0
+    return mean, Z_95 * math.sqrt(variance / n)
+
+
+def wilson_interval(successes, n):
+    """Returns the 95% Wilson score interval of a proportion"""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + Z_95 ** 2 / n
+    center = (p + Z_95 ** 2 / (2 * n)) / denominator
+    half_width = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n * n)) / denominator
+    return center - half_width, center + half_width
+
+
+def print_report(summary, seats):
+    """Prints the score, win rate and moon-shot rate of each seat with 95% confidence intervals"""
+    games = summary["games"]
+    hands = summary["hands"]
+    print(f"{games} games, {hands} hands")
+    print("{:<6}{:<12}{:>22}{:>24}{:>24}".format("Seat", "Player", "Final score", "Win rate", "Moons per hand"))
+    for seat in range(4):
+        score, score_error = mean_interval(summary["score_sum"][seat], summary["score_square_sum"][seat], games)
+        win_low, win_high = wilson_interval(summary["wins"][seat], games)
+        moon_low, moon_high = wilson_interval(summary["moons"][seat], hands)
+        print("{:<6}{:<12}{:>22}{:>24}{:>24}".format(
+            seat + 1, seats[seat], f"{score:.2f} ± {score_error:.2f}",
+            f"{summary['wins'][seat] / games:.2%} [{win_low:.2%}, {win_high:.2%}]",
+            f"{summary['moons'][seat] / hands:.3%} [{moon_low:.3%}, {moon_high:.3%}]"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a tournament of headless Hearts games.")
+    parser.add_argument("--games", type=int, default=10000, help="number of games to play")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--seats", nargs=4, default=["computer"] * 4, choices=sorted(PLAYER_TYPES),
+                        help="player type for each of the four seats")
+    args = parser.parse_args()
+
+    start_time = perf_counter()
+    tournament = run_tournament(args.games, args.seats, args.seed, args.workers)
+    elapsed = perf_counter() - start_time
+    print_report(tournament, args.seats)
+    print(f"Finished in {elapsed:.2f}s ({tournament['hands'] / elapsed:,.0f} hands per second)")
@@ -0,0 +1,230 @@
+"""
+This program checks the Monopoly simulation in monopoly_simulation.py against the Markov chain in
+monopoly_markov_chain.py, and measures how fast each of them is.
+
+Both are run with the same rules, with leave_jail_immediately off and on.  Each simulation engine is run for a range of
+turn counts, and the total variation distance between its space frequencies and the chain's steady state (half the
+sum of the absolute differences) shows how quickly it converges.  The wall-clock time, turns per second and peak
+memory of every run are recorded, and everything is saved as JSON.  Given an earlier result file as a baseline, the
+benchmark fails if a simulation has become much slower or no longer agrees with the chain:
+
+    python monopoly_benchmark.py --output monopoly_benchmark.json
+    python monopoly_benchmark.py --baseline monopoly_benchmark.json --output new_benchmark.json
+"""
+
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from time import perf_counter
+
+import numpy as np
+
+import monopoly_simulation
+from monopoly_markov_chain import MarkovModel
+
+
+def peak_memory(function, *args, **kwargs):
+    """Runs a function under tracemalloc and returns the peak memory it allocated, in bytes"""
+    tracemalloc.start()
+    try:
+        function(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def simulate_scalar(turns, walkers, jail_immediately, rng, warmup_turns=0):
+    """Runs the original one-turn-at-a-time simulation, seeded from a numpy generator, in the format of
+    simulate_vectorized.  There is only one player, which takes warmup_turns uncounted turns first."""
+    random.seed(int(rng.integers(2 ** 32)))
+    monopoly_simulation.leave_jail_immediately = jail_immediately
+    monopoly_simulation.current_space = monopoly_simulation.space_to_num["Go"]
+    monopoly_simulation.num_doubles = 0
+    monopoly_simulation.jail_rolls = 0
+    counts = np.zeros(len(monopoly_simulation.spaces), dtype=np.int64)
+    for i in range(warmup_turns):
+        monopoly_simulation.take_turn()
+    for i in range(turns):
+        monopoly_simulation.take_turn()
+        counts[monopoly_simulation.current_space] += 1
+    return counts
+
+
+ENGINES = {
+    "scalar": simulate_scalar,
+    "vectorized": monopoly_simulation.simulate_vectorized,
+    "decks": monopoly_simulation.simulate_decks,
+}
+
+# The number of uncounted turns each player takes before a timed run starts counting
+WARMUP_TURNS = 20
+
+
+def warmup_work(engine, turns, walkers, warmup_turns=WARMUP_TURNS):
+    """Returns the number of uncounted turns an engine simulates before it starts counting, which are part of the
+    work a timed run does.  The vectorized engines warm up every player they move at once, and the scalar engine its
+    one player."""
+    players = 1 if engine == "scalar" else max(min(walkers, turns), 1)
+    return warmup_turns * players
+
+
+def solve_chain(jail_immediately):
+    """Builds and solves the Markov chain without its cache
+
+    Returns:
+        numpy.ndarray: The steady-state frequency of each space, in the order of monopoly_simulation.spaces
+    """
+    model = MarkovModel(jail_immediately=jail_immediately, cache_dir=None)
+    frequencies = model.space_frequencies(model.stationary()["distribution"])
+    return np.array([frequencies[space] for space in monopoly_simulation.spaces])
+
+
+def run_benchmark(turn_counts, engines, walkers=100000, seed=0, scalar_max_turns=1000000):
+    """Runs the chain and every simulation engine with and without leaving jail immediately
+
+    Peak memory is measured in a separate run from the timing, since tracing slows allocation down.  The simulations'
+    memory doesn't grow with the number of turns, so it is measured with at most two turns per walker.  Every engine
+    warms its players up inside the timed call, so the warmup turns are counted in its turns per second.
+
+    Arguments:
+        turn_counts: The numbers of turns to simulate
+        engines: The names of the simulation engines to run, from ENGINES
+        walkers: The number of players the vectorized engines move at once
+        seed: Seeds every simulation, so the same seed always gives the same distances
+        scalar_max_turns: The most turns to run the slow scalar engine for
+
+    Returns:
+        dict: The settings, and a list of the results of the chain and each simulation run
+    """
+    results = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "settings": {"turn_counts": turn_counts, "engines": engines, "walkers": walkers, "seed": seed,
+                     "scalar_max_turns": scalar_max_turns},
+        "chain": [],
+        "simulations": [],
+    }
+    for jail_immediately in (False, True):
+        start_time = perf_counter()
+        chain_frequencies = solve_chain(jail_immediately)
+        results["chain"].append({
+            "jail_immediately": jail_immediately,
+            "seconds": perf_counter() - start_time,
+            "peak_memory": peak_memory(solve_chain, jail_immediately),
+        })
+
+        for engine in engines:
+            simulate = ENGINES[engine]
+            # Builds the engine's lookup tables before anything is timed
+            simulate(1, 1, jail_immediately, np.random.default_rng(seed))
+            for turns in turn_counts:
+                if engine == "scalar" and turns > scalar_max_turns:
+                    continue
+                rng = np.random.default_rng([seed, turns, jail_immediately])
+                start_time = perf_counter()
+                counts = simulate(turns, walkers, jail_immediately, rng, warmup_turns=WARMUP_TURNS)
+                elapsed = perf_counter() - start_time
+                warmup = warmup_work(engine, turns, walkers)
+                memory = peak_memory(simulate, min(turns, 2 * walkers), walkers, jail_immediately, rng)
+                results["simulations"].append({
+                    "engine": engine,
+                    "jail_immediately": jail_immediately,
+                    "turns": turns,
+                    "warmup_turns": warmup,
+                    "seconds": elapsed,
+                    "turns_per_second": (turns + warmup) / elapsed,
+                    "peak_memory": memory,
+                    "tv_distance": float(np.abs(counts / counts.sum() - chain_frequencies).sum() / 2),
+                })
+    return results
+
+
+def find_regressions(results, baseline, max_slowdown=0.25, max_tv=0.002, min_seconds=0.1):
+    """Compares benchmark results with an earlier run
+
+    Arguments:
+        results: The results of run_benchmark
+        baseline: The results of an earlier run_benchmark
+        max_slowdown: The largest fraction of a simulation's baseline throughput that it may lose
+        max_tv: The largest total variation distance from the chain allowed for the longest run of each engine and
+            jail setting after 10 million turns.  Shorter runs are allowed more in proportion to one over the square
+            root of their turns, like the random error.  The decks engine isn't checked, since it models shuffled
+            decks instead of the chain's cards drawn at random.
+        min_seconds: Runs that took less time than this in the baseline are too noisy to compare throughput with
+
+    Returns:
+        list: A description of each regression found
+    """
+    regressions = []
+    baseline_runs = {(run["engine"], run["jail_immediately"], run["turns"]): run for run in baseline["simulations"]}
+    longest_runs = {}
+    for run in results["simulations"]:
+        key = (run["engine"], run["jail_immediately"], run["turns"])
+        old_run = baseline_runs.get(key)
+        if old_run is None or old_run["seconds"] < min_seconds:
+            pass
+        elif run["turns_per_second"] < old_run["turns_per_second"] * (1 - max_slowdown):
+            regressions.append(f"{key}: {run['turns_per_second']:,.0f} turns/sec, down from "
+                               f"{old_run['turns_per_second']:,.0f}")
+        if run["turns"] >= longest_runs.get(key[:2], {"turns": 0})["turns"]:
+            longest_runs[key[:2]] = run
+    for (engine, jail_immediately), run in longest_runs.items():
+        limit = max_tv * math.sqrt(10000000 / run["turns"])
+        if engine != "decks" and run["tv_distance"] > limit:
+            regressions.append(f"{(engine, jail_immediately, run['turns'])}: total variation distance "
+                               f"{run['tv_distance']:.5f} from the chain is over {limit:.5f}")
+    return regressions
+
+
+def print_results(results):
+    """Prints the chain and simulation results as tables"""
+    print("{:<18}{:>12}{:>14}".format("Chain", "Time ms", "Peak memory"))
+    for run in results["chain"]:
+        jail = "leave jail" if run["jail_immediately"] else "stay in jail"
+        print(f"{jail:<18}{run['seconds'] * 1000:>12.1f}{run['peak_memory'] / 1024:>10,.0f} KiB")
+    print()
+    print("{:<12}{:<14}{:>14}{:>12}{:>12}{:>16}{:>14}{:>14}".format(
+        "Engine", "Jail", "Turns", "Warmup", "Time s", "Turns/sec", "Peak memory", "TV distance"))
+    for run in results["simulations"]:
+        jail = "leave" if run["jail_immediately"] else "stay"
+        print(f"{run['engine']:<12}{jail:<14}{run['turns']:>14,}{run.get('warmup_turns', 0):>12,}"
+              f"{run['seconds']:>12.3f}"
+              f"{run['turns_per_second']:>16,.0f}{run['peak_memory'] / 1024:>10,.0f} KiB{run['tv_distance']:>14.5f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the Monopoly simulation against the Markov chain.")
+    parser.add_argument("--turns", type=int, nargs="+", default=[10000, 100000, 1000000, 10000000],
+                        help="numbers of turns to simulate")
+    parser.add_argument("--engines", nargs="+", default=["scalar", "vectorized", "decks"], choices=sorted(ENGINES),
+                        help="simulation engines to run")
+    parser.add_argument("--walkers", type=int, default=100000, help="players moved at once by the vectorized engines")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--scalar-max-turns", type=int, default=1000000, help="most turns to run the scalar engine")
+    parser.add_argument("--output", help="file to save the results to as JSON")
+    parser.add_argument("--baseline", help="earlier results file to check for regressions against")
+    parser.add_argument("--max-slowdown", type=float, default=0.25,
+                        help="largest fraction of its baseline throughput a simulation may lose")
+    parser.add_argument("--max-tv", type=float, default=0.002,
+                        help="largest total variation distance from the chain allowed after 10 million turns")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.turns, args.engines, args.walkers, args.seed, args.scalar_max_turns)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results, baseline, args.max_slowdown, args.max_tv)
+        for regression in regressions:
+            print(regression, file=sys.stderr)
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,483 @@
+"""
+This program plays complete multi-player games of Monopoly, with cash, property ownership, rent, houses and hotels,
+mortgages and bankruptcy, to compare buying and building strategies over large numbers of games.
+
+It builds on the board model of monopoly_simulation.py: players move with the same transition tables as its vectorized
+engine, and the Chance and Community Chest decks are the ones from build_deck, with the cards that don't move the
+player given their cash effects.  Many games are played at once in lock-step with NumPy.  Each game is one record of
+GAME_DTYPE, which holds everything about the game in under 150 bytes.
+
+Some rules are simplified: cards that send a player to the nearest railroad or utility charge the normal rent, Get
+Out of Jail Free cards have no effect, there are no auctions or trades, houses are unlimited, and mortgaged property
+passes to a creditor without interest.
+
+    python monopoly_game.py --games 100000 --seed 1 --seats default default cautious aggressive
+"""
+
+import argparse
+from collections import namedtuple
+from time import perf_counter
+
+import numpy as np
+
+from monopoly_simulation import (JAIL_STATE, NUM_STATES, STATE_SPACES, build_deck, landing_table, next_state,
+                                 space_to_num, transition_table)
+
+MAX_PLAYERS = 4
+STARTING_CASH = 1500
+GO_SALARY = 200
+JAIL_FEE = 50
+
+# Everything about one game: each player's movement state (in the layout of monopoly_simulation), cash and whether
+# they are bankrupt, the owner (-1 for the bank), houses (5 for a hotel) and mortgage of each space, whose turn it
+# is, and the number of turns played
+GAME_DTYPE = np.dtype([
+    ("state", np.int8, MAX_PLAYERS),
+    ("cash", np.int32, MAX_PLAYERS),
+    ("bankrupt", np.bool_, MAX_PLAYERS),
+    ("owner", np.int8, 40),
+    ("houses", np.int8, 40),
+    ("mortgaged", np.bool_, 40),
+    ("current", np.int8),
+    ("turns", np.int32),
+])
+
+# The price, rent with 0 to 4 houses and a hotel, and house cost of each street, by space name
+STREETS = {
+    "Mediterranean Avenue": (60, (2, 10, 30, 90, 160, 250), 50),
+    "Baltic Avenue": (60, (4, 20, 60, 180, 320, 450), 50),
+    "Oriental Avenue": (100, (6, 30, 90, 270, 400, 550), 50),
+    "Vermont Avenue": (100, (6, 30, 90, 270, 400, 550), 50),
+    "Connecticut Avenue": (120, (8, 40, 100, 300, 450, 600), 50),
+    "St. Charles Place": (140, (10, 50, 150, 450, 625, 750), 100),
+    "States Avenue": (140, (10, 50, 150, 450, 625, 750), 100),
+    "Virginia Avenue": (160, (12, 60, 180, 500, 700, 900), 100),
+    "St. James Place": (180, (14, 70, 200, 550, 750, 950), 100),
+    "Tennessee Avenue": (180, (14, 70, 200, 550, 750, 950), 100),
+    "New York Avenue": (200, (16, 80, 220, 600, 800, 1000), 100),
+    "Kentucky Avenue": (220, (18, 90, 250, 700, 875, 1050), 150),
+    "Indiana Avenue": (220, (18, 90, 250, 700, 875, 1050), 150),
+    "Illinois Avenue": (240, (20, 100, 300, 750, 925, 1100), 150),
+    "Atlantic Avenue": (260, (22, 110, 330, 800, 975, 1150), 150),
+    "Ventnor Avenue": (260, (22, 110, 330, 800, 975, 1150), 150),
+    "Marvin Gardens": (280, (24, 120, 360, 850, 1025, 1200), 150),
+    "Pacific Avenue": (300, (26, 130, 390, 900, 1100, 1275), 200),
+    "North Carolina Avenue": (300, (26, 130, 390, 900, 1100, 1275), 200),
+    "Pennsylvania Avenue": (320, (28, 150, 450, 1000, 1200, 1400), 200),
+    "Park Place": (350, (35, 175, 500, 1100, 1300, 1500), 200),
+    "Boardwalk": (400, (50, 200, 600, 1400, 1700, 2000), 200),
+}
+COLOR_GROUPS = [
+    ("Mediterranean Avenue", "Baltic Avenue"),
+    ("Oriental Avenue", "Vermont Avenue", "Connecticut Avenue"),
+    ("St. Charles Place", "States Avenue", "Virginia Avenue"),
+    ("St. James Place", "Tennessee Avenue", "New York Avenue"),
+    ("Kentucky Avenue", "Indiana Avenue", "Illinois Avenue"),
+    ("Atlantic Avenue", "Ventnor Avenue", "Marvin Gardens"),
+    ("Pacific Avenue", "North Carolina Avenue", "Pennsylvania Avenue"),
+    ("Park Place", "Boardwalk"),
+]
+RAILROADS = [space_to_num[name] for name in ("Reading Railroad", "Pennsylvania Railroad", "B&O Railroad", "Short Line")]
+UTILITIES = [space_to_num[name] for name in ("Electric Company", "Water Works")]
+TAXES = {"Income Tax": 200, "Luxury Tax": 100}
+
+# Lookup tables indexed by space
+STREET, RAILROAD, UTILITY = range(1, 4)
+SPACE_KINDS = np.zeros(40, dtype=np.int8)
+PRICES = np.zeros(40, dtype=np.int32)
+RENTS = np.zeros((40, 6), dtype=np.int32)
+HOUSE_COSTS = np.zeros(40, dtype=np.int32)
+TAX_AMOUNTS = np.zeros(40, dtype=np.int32)
+for name, (price, rents, house_cost) in STREETS.items():
+    SPACE_KINDS[space_to_num[name]] = STREET
+    PRICES[space_to_num[name]] = price
+    RENTS[space_to_num[name]] = rents
+    HOUSE_COSTS[space_to_num[name]] = house_cost
+SPACE_KINDS[RAILROADS] = RAILROAD
+PRICES[RAILROADS] = 200
+SPACE_KINDS[UTILITIES] = UTILITY
+PRICES[UTILITIES] = 150
+for name, amount in TAXES.items():
+    TAX_AMOUNTS[space_to_num[name]] = amount
+
+# The color group of each space (the extra group 8 stands for spaces that aren't streets), and the spaces in each
+# color group, with two-street groups padded by repeating their first street
+SPACE_GROUPS = np.full(40, len(COLOR_GROUPS), dtype=np.intp)
+GROUP_SPACES = np.zeros((len(COLOR_GROUPS), 3), dtype=np.intp)
+for group, names in enumerate(COLOR_GROUPS):
+    for i in range(3):
+        GROUP_SPACES[group, i] = space_to_num[names[min(i, len(names) - 1)]]
+    SPACE_GROUPS[[space_to_num[name] for name in names]] = group
+
+# The cash effect of each card in each deck that doesn't move the player, by its position in build_deck, which puts
+# the moving cards first.  The last card of each deck is its Get Out of Jail Free card.
+CASH, PAY_EACH_PLAYER, COLLECT_FROM_EACH_PLAYER, REPAIRS = range(1, 5)
+CHANCE_CARDS = [(CASH, 50), (CASH, 150), (CASH, -15), (PAY_EACH_PLAYER, 50), (REPAIRS, 0), (0, 0)]
+COMMUNITY_CHEST_CARDS = [(CASH, 200), (CASH, -50), (CASH, 50), (CASH, 100), (CASH, 20), (COLLECT_FROM_EACH_PLAYER, 10),
+                         (CASH, 100), (CASH, -100), (CASH, -50), (CASH, 25), (REPAIRS, 0), (CASH, 10), (CASH, 100),
+                         (0, 0)]
+CARD_KINDS = np.zeros((2, 16), dtype=np.int8)
+CARD_AMOUNTS = np.zeros((2, 16), dtype=np.int32)
+for deck, (deck_space, cards) in enumerate([("Chance 1", CHANCE_CARDS), ("Community Chest 1", COMMUNITY_CHEST_CARDS)]):
+    first_cash_card = 16 - len(cards)
+    assert all(card is None for card in build_deck(space_to_num[deck_space])[first_cash_card:])
+    for i, (kind, amount) in enumerate(cards):
+        CARD_KINDS[deck, first_cash_card + i] = kind
+        CARD_AMOUNTS[deck, first_cash_card + i] = amount
+# The cost per house and per hotel of the repairs card in each deck
+REPAIR_COSTS = np.array([[25, 100], [40, 115]], dtype=np.int32)
+
+# The dice total of each of the 36 rolls, and whether it is doubles
+ROLL_TOTALS = np.array([roll // 6 + roll % 6 + 2 for roll in range(36)], dtype=np.int32)
+ROLL_DOUBLES = np.array([roll // 6 == roll % 6 for roll in range(36)])
+
+# A player's strategy: they buy property only if they would have at least buy_reserve left afterward, build houses
+# only if they would have at least build_reserve left, and pay to leave jail immediately if pay_jail is set
+Strategy = namedtuple("Strategy", ["buy_reserve", "build_reserve", "pay_jail"])
+STRATEGIES = {
+    "default": Strategy(buy_reserve=0, build_reserve=200, pay_jail=False),
+    "cautious": Strategy(buy_reserve=300, build_reserve=500, pay_jail=False),
+    "aggressive": Strategy(buy_reserve=0, build_reserve=0, pay_jail=True),
+    "collector": Strategy(buy_reserve=0, build_reserve=100000, pay_jail=False),
+}
+
+
+def passes_go(state, die_1, die_2, card, jail_immediately):
+    """Returns whether a player passes or lands on Go during a turn, and so collects their salary
+
+    Arguments are the same as monopoly_simulation.next_state.
+    """
+    end = next_state(state, die_1, die_2, card, jail_immediately)
+    if end >= JAIL_STATE:
+        return False
+    start = space_to_num["Visiting Jail"] if state >= JAIL_STATE else state % 40
+    rolled = (start + die_1 + die_2) % 40
+    passed = rolled < start
+    # Cards advance the player forward, apart from going back 3 spaces
+    if end % 40 != rolled and end % 40 != rolled - 3:
+        passed = passed or end % 40 < rolled
+    return passed
+
+
+def movement_tables(jail_immediately):
+    """Builds the lookup tables for moving a player, indexed by (state * 36 + roll) * 16 + card
+
+    Returns:
+        tuple: The next state, whether the player collects their Go salary, and the deck drawn from (indexed by
+            state * 36 + roll, with -1 for no deck)
+    """
+    salary = np.zeros((NUM_STATES, 36, 16), dtype=bool)
+    for state in range(NUM_STATES):
+        for roll in range(36):
+            for card in range(16):
+                salary[state, roll, card] = passes_go(state, roll // 6 + 1, roll % 6 + 1, card, jail_immediately)
+    return transition_table(jail_immediately), salary.reshape(-1), landing_table(jail_immediately)
+
+
+def new_games(num_games, num_players, rng):
+    """Returns an array of games that are ready to start, each with a random first player"""
+    games = np.zeros(num_games, dtype=GAME_DTYPE)
+    games["cash"][:, :num_players] = STARTING_CASH
+    games["bankrupt"][:, num_players:] = True
+    games["owner"] = -1
+    games["current"] = rng.integers(0, num_players, num_games)
+    return games
+
+
+def group_complete(owner, players):
+    """Finds which color groups each player owns all of
+
+    Arguments:
+        owner: The owner of each space in each game, shaped (games, 40)
+        players: The player to check in each game
+
+    Returns:
+        numpy.ndarray: Whether the player owns each color group, shaped (games, 9), where the last group stands for
+            spaces that aren't streets and is never complete
+    """
+    complete = np.zeros((len(players), len(COLOR_GROUPS) + 1), dtype=bool)
+    complete[:, :-1] = (owner[:, GROUP_SPACES] == players[:, None, None]).all(axis=2)
+    return complete
+
+
+def raise_cash(games, rows, seats, creditors, owed):
+    """Sells houses and mortgages property for each player that owes money, bankrupting those who can't pay
+
+    Houses are sold one at a time from the player's most built-up street, for half their cost, and then property is
+    mortgaged for half its price, cheapest first.  A bankrupt player's property goes to the player they owe, or back
+    to the bank.  The creditor has already been paid in full, so the part of what they were owed that the bankrupt
+    player couldn't cover is taken back from them.  Any shortfall beyond that was owed to the bank.
+
+    Arguments:
+        games: The array of games, which is modified in place
+        rows: The game of each player in debt
+        seats: The seat of each player in debt
+        creditors: The seat each player owes, or -1 for the bank
+        owed: The amount each player was charged this turn by their creditor
+    """
+    cash, owner, houses, mortgaged = games["cash"], games["owner"], games["houses"], games["mortgaged"]
+    while len(rows):
+        in_debt = cash[rows, seats] < 0
+        rows, seats, creditors, owed = rows[in_debt], seats[in_debt], creditors[in_debt], owed[in_debt]
+        if not len(rows):
+            break
+        owned = owner[rows] == seats[:, None]
+        built = np.where(owned, houses[rows], 0)
+        selling = built.max(axis=1) > 0
+        sale_spaces = built.argmax(axis=1)
+        mortgageable = owned & ~mortgaged[rows]
+        mortgaging = ~selling & mortgageable.any(axis=1)
+        mortgage_spaces = np.where(mortgageable, PRICES, 10000).argmin(axis=1)
+
+        sell_rows, sell_spaces = rows[selling], sale_spaces[selling]
+        houses[sell_rows, sell_spaces] -= 1
+        np.add.at(cash, (sell_rows, seats[selling]), HOUSE_COSTS[sell_spaces] // 2)
+        mortgage_rows, mortgage_spaces = rows[mortgaging], mortgage_spaces[mortgaging]
+        mortgaged[mortgage_rows, mortgage_spaces] = True
+        np.add.at(cash, (mortgage_rows, seats[mortgaging]), PRICES[mortgage_spaces] // 2)
+
+        # Bankruptcies are rare, so they are handled one at a time
+        broke = ~selling & ~mortgaging
+        for row, seat, creditor, amount in zip(rows[broke], seats[broke], creditors[broke], owed[broke]):
+            owned_spaces = owner[row] == seat
+            if creditor >= 0 and not games["bankrupt"][row, creditor]:
+                cash[row, creditor] -= min(-cash[row, seat], amount)
+                owner[row, owned_spaces] = creditor
+            else:
+                owner[row, owned_spaces] = -1
+                mortgaged[row, owned_spaces] = False
+            cash[row, seat] = 0
+            games["bankrupt"][row, seat] = True
+            games["state"][row, seat] = 0
+        paid = selling | mortgaging
+        rows, seats, creditors, owed = rows[paid], seats[paid], creditors[paid], owed[paid]
+
+
+def develop(games, rows, players, build_reserves):
+    """Has a player in each of the given games pay off mortgages and then build houses evenly on their color groups
+
+    Arguments:
+        games: The array of games, which is modified in place
+        rows: The games to develop in
+        players: The player developing in each of those games
+        build_reserves: The build reserve of each seat
+    """
+    cash, owner, houses, mortgaged = games["cash"], games["owner"], games["houses"], games["mortgaged"]
+
+    # Pays off mortgages, cheapest first, for the mortgage plus 10% interest
+    has_mortgages = mortgaged[rows].any(axis=1)
+    paying_rows, paying_players = rows[has_mortgages], players[has_mortgages]
+    while len(paying_rows):
+        owned_mortgages = (owner[paying_rows] == paying_players[:, None]) & mortgaged[paying_rows]
+        spaces_to_pay = np.where(owned_mortgages, PRICES, 10000).argmin(axis=1)
+        cost = PRICES[spaces_to_pay] // 2 * 11 // 10
+        paying = owned_mortgages.any(axis=1) & (cash[paying_rows, paying_players] - cost
+                                                >= build_reserves[paying_players])
+        paying_rows, paying_players = paying_rows[paying], paying_players[paying]
+        mortgaged[paying_rows, spaces_to_pay[paying]] = False
+        cash[paying_rows, paying_players] -= cost[paying]
+
+    # Builds one house at a time on the least built-up street of the player's unmortgaged color groups
+    complete = group_complete(owner[rows], players)
+    complete[:, :-1] &= ~mortgaged[rows][:, GROUP_SPACES].any(axis=2)
+    building = complete[:, :-1].any(axis=1)
+    rows, players, complete = rows[building], players[building], complete[building]
+    while len(rows):
+        row_houses = houses[rows]
+        group_minimum = np.full((len(rows), len(COLOR_GROUPS) + 1), 5, dtype=np.int8)
+        group_minimum[:, :-1] = row_houses[:, GROUP_SPACES].min(axis=2)
+        buildable = complete[:, SPACE_GROUPS] & (row_houses < 5) & (row_houses == group_minimum[:, SPACE_GROUPS])
+        # Prefers the streets with the fewest houses, and then the most expensive ones
+        spaces_to_build = np.where(buildable, row_houses * 64 - np.arange(40), 1000).argmin(axis=1)
+        building = buildable.any(axis=1) & (cash[rows, players] - HOUSE_COSTS[spaces_to_build]
+                                            >= build_reserves[players])
+        rows, players, complete, spaces_to_build = (rows[building], players[building], complete[building],
+                                                    spaces_to_build[building])
+        houses[rows, spaces_to_build] += 1
+        cash[rows, players] -= HOUSE_COSTS[spaces_to_build]
+
+
+def play_turn(games, strategies, tables, rng):
+    """Plays one turn of every game in the array
+
+    Arguments:
+        games: The array of games, which is modified in place
+        strategies: The Strategy of each seat, as arrays of buy reserves, build reserves and jail policies
+        tables: The movement tables for rolling to leave jail and for paying to leave, from movement_tables
+        rng: A numpy.random.Generator
+    """
+    num_games = len(games)
+    rows = np.arange(num_games)
+    buy_reserves, build_reserves, pay_jail = strategies
+    cash, owner, houses, mortgaged = games["cash"], games["owner"], games["houses"], games["mortgaged"]
+    players = games["current"].astype(np.intp)
+    state = games["state"][rows, players].astype(np.int32)
+
+    # Moves the player, collecting their salary for passing Go and paying to leave jail
+    roll = rng.integers(0, 36, num_games, dtype=np.int32)
+    card = rng.integers(0, 16, num_games, dtype=np.int32)
+    roll_index = state * 36 + roll
+    outcome = roll_index * 16 + card
+    paying = pay_jail[players]
+    (roll_states, roll_salary, roll_decks), (pay_states, pay_salary, pay_decks) = tables
+    new_state = np.where(paying, pay_states[outcome], roll_states[outcome]).astype(np.int32)
+    salary = np.where(paying, pay_salary[outcome], roll_salary[outcome])
+    deck = np.where(paying, pay_decks[roll_index], roll_decks[roll_index])
+    jailed = state >= JAIL_STATE
+    jail_fee = jailed & (paying | ((state == JAIL_STATE + 2) & ~ROLL_DOUBLES[roll]))
+    cash[rows, players] += GO_SALARY * salary - JAIL_FEE * jail_fee
+    games["state"][rows, players] = new_state
+    space = STATE_SPACES[new_state] % 40
+    creditors = np.full(num_games, -1, dtype=np.intp)
+    owed = np.zeros(num_games, dtype=np.int64)
+
+    # Pays taxes, and carries out the cash cards
+    cash[rows, players] -= np.where(new_state < JAIL_STATE, TAX_AMOUNTS[space], 0)
+    card_kind = np.where(deck >= 0, CARD_KINDS[deck, card], 0)
+    card_amount = CARD_AMOUNTS[deck, card]
+    cash[rows, players] += np.where(card_kind == CASH, card_amount, 0)
+    others = ~games["bankrupt"]
+    others[rows, players] = False
+    exchanging = np.nonzero((card_kind == PAY_EACH_PLAYER) | (card_kind == COLLECT_FROM_EACH_PLAYER))[0]
+    if len(exchanging):
+        # Positive amounts go from the player to each other player, and negative ones the other way
+        amount = np.where(card_kind[exchanging] == PAY_EACH_PLAYER, 1, -1) * card_amount[exchanging]
+        cash[exchanging] += others[exchanging] * amount[:, None]
+        cash[exchanging, players[exchanging]] -= others[exchanging].sum(axis=1) * amount
+    repairing = np.nonzero(card_kind == REPAIRS)[0]
+    if len(repairing):
+        owned_houses = np.where(owner[repairing] == players[repairing, None], houses[repairing], 0)
+        costs = REPAIR_COSTS[deck[repairing]]
+        cash[repairing, players[repairing]] -= (((owned_houses > 0) & (owned_houses < 5)).sum(axis=1) * costs[:, 0]
+                                                + (owned_houses == 5).sum(axis=1) * costs[:, 1])
+
+    # Buys unowned property if the player can afford it while keeping their reserve
+    landed_owner = np.where(new_state < JAIL_STATE, owner[rows, space], -1)
+    price = PRICES[space]
+    buying = (price > 0) & (landed_owner == -1) & (new_state < JAIL_STATE) & (cash[rows, players] - price
+                                                                                >= buy_reserves[players])
+    owner[rows[buying], space[buying]] = players[buying]
+    cash[rows[buying], players[buying]] -= price[buying]
+
+    # Pays rent to the owner of the property landed on
+    renting = np.nonzero((landed_owner >= 0) & (landed_owner != players) & ~mortgaged[rows, space])[0]
+    if len(renting):
+        rent_space = space[renting]
+        landlord = landed_owner[renting].astype(np.intp)
+        kind = SPACE_KINDS[rent_space]
+        landlord_owns = owner[renting] == landlord[:, None]
+        street_houses = houses[renting, rent_space]
+        monopoly = group_complete(owner[renting], landlord)[np.arange(len(renting)), SPACE_GROUPS[rent_space]]
+        street_rent = RENTS[rent_space, street_houses] * np.where(monopoly & (street_houses == 0), 2, 1)
+        railroad_rent = 25 << np.maximum(landlord_owns[:, RAILROADS].sum(axis=1) - 1, 0)
+        utility_rent = ROLL_TOTALS[roll[renting]] * np.where(landlord_owns[:, UTILITIES].all(axis=1), 10, 4)
+        rent = np.select([kind == STREET, kind == RAILROAD], [street_rent, railroad_rent], utility_rent)
+        cash[renting, players[renting]] -= rent
+        cash[renting, landlord] += rent
+        creditors[renting] = landlord
+        owed[renting] = rent
+
+    # Settles every debt, which can include other players' after a card
+    debt_rows, debt_seats = np.nonzero((cash < 0) & ~games["bankrupt"])
+    if len(debt_rows):
+        # Other players can only be in debt from paying the current player for a card
+        current = debt_seats == players[debt_rows]
+        debt_creditors = np.where(current, creditors[debt_rows], players[debt_rows])
+        collected = np.where(card_kind[debt_rows] == COLLECT_FROM_EACH_PLAYER, card_amount[debt_rows], 0)
+        raise_cash(games, debt_rows, debt_seats, debt_creditors, np.where(current, owed[debt_rows], collected))
+
+    still_playing = ~games["bankrupt"][rows, players]
+    develop(games, rows[still_playing], players[still_playing], build_reserves)
+
+    # Players who rolled doubles go again, unless they went to jail
+    games["turns"] += 1
+    again = still_playing & (new_state >= 40) & (new_state < JAIL_STATE)
+    next_players = players.copy()
+    for offset in range(MAX_PLAYERS - 1, 0, -1):
+        candidate = (players + offset) % MAX_PLAYERS
+        next_players = np.where(~games["bankrupt"][rows, candidate], candidate, next_players)
+    games["current"] = np.where(again, players, next_players)
+
+
+def net_worth(games):
+    """Returns the net worth of each player in each game: their cash, plus the price of their property (half if
+    mortgaged) and the cost of their houses
+
+    Returns:
+        numpy.ndarray: The net worth of each player, shaped (games, MAX_PLAYERS)
+    """
+    values = np.where(games["mortgaged"], PRICES // 2, PRICES) + games["houses"] * HOUSE_COSTS
+    worth = games["cash"].astype(np.int64)
+    for seat in range(MAX_PLAYERS):
+        worth[:, seat] += np.where(games["owner"] == seat, values, 0).sum(axis=1)
+    return worth
+
+
+def play_games(num_games, seats=("default",) * 4, seed=None, max_turns=2000, batch_size=50000):
+    """Plays complete games between players with the given strategies
+
+    Arguments:
+        num_games: The number of games to play
+        seats: The name of the strategy in STRATEGIES of each player, from 2 to 4 players
+        seed: Seeds the numpy random number generator
+        max_turns: The number of turns after which an unfinished game is stopped
+        batch_size: The number of games played at once
+
+    Returns:
+        dict: The number of games, the wins of each seat, the number of unfinished games, how many of those each seat
+            was leading on net worth when stopped, and the total number of turns played
+    """
+    rng = np.random.default_rng(seed)
+    num_players = len(seats)
+    strategies = [STRATEGIES[seat] for seat in seats] + [STRATEGIES["default"]] * (MAX_PLAYERS - num_players)
+    strategy_arrays = (np.array([strategy.buy_reserve for strategy in strategies]),
+                       np.array([strategy.build_reserve for strategy in strategies]),
+                       np.array([strategy.pay_jail for strategy in strategies]))
+    tables = (movement_tables(False), movement_tables(True))
+
+    results = {"games": num_games, "wins": [0] * num_players, "unfinished": 0, "leading": [0] * num_players,
+               "turns": 0}
+    for batch_start in range(0, num_games, batch_size):
+        games = new_games(min(batch_size, num_games - batch_start), num_players, rng)
+        while len(games):
+            play_turn(games, strategy_arrays, tables, rng)
+            # Finished games are removed from the batch
+            remaining = (~games["bankrupt"]).sum(axis=1)
+            finished = (remaining <= 1) | (games["turns"] >= max_turns)
+            if finished.any():
+                done = games[finished]
+                won = (~done["bankrupt"]).sum(axis=1) == 1
+                for seat, wins in enumerate(np.bincount(np.argmax(~done["bankrupt"][won], axis=1),
+                                                        minlength=num_players)):
+                    results["wins"][seat] += int(wins)
+                results["unfinished"] += int((~won).sum())
+                for seat, leads in enumerate(np.bincount(net_worth(done[~won]).argmax(axis=1), minlength=num_players)):
+                    results["leading"][seat] += int(leads)
+                results["turns"] += int(done["turns"].sum())
+                games = games[~finished]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play complete games of Monopoly between strategies.")
+    parser.add_argument("--games", type=int, default=10000, help="number of games to play")
+    parser.add_argument("--seed", type=int, help="seed for the random number generator")
+    parser.add_argument("--seats", nargs="+", default=["default"] * 4, choices=sorted(STRATEGIES),
+                        help="strategy of each player, for 2 to 4 players")
+    parser.add_argument("--max-turns", type=int, default=2000, help="number of turns before a game is stopped")
+    parser.add_argument("--batch-size", type=int, default=50000, help="number of games played at once")
+    args = parser.parse_args()
+    if not 2 <= len(args.seats) <= MAX_PLAYERS:
+        parser.error(f"--seats needs 2 to {MAX_PLAYERS} strategies")
+
+    start_time = perf_counter()
+    results = play_games(args.games, args.seats, args.seed, args.max_turns, args.batch_size)
+    elapsed = perf_counter() - start_time
+    print(f"Played {results['games']:,} games in {elapsed:.2f}s ({results['games'] / elapsed:,.0f} games per second, "
+          f"{results['turns'] / elapsed:,.0f} turns per second)")
+    print(f"Each game's state takes {GAME_DTYPE.itemsize} bytes")
+    print(f"Average length: {results['turns'] / results['games']:.0f} turns, "
+          f"{results['unfinished'] / results['games']:.1%} unfinished after {args.max_turns} turns")
+    for seat, strategy in enumerate(args.seats):
+        print(f"Seat {seat + 1} ({strategy}): {results['wins'][seat] / results['games']:.1%} wins, leading "
+              f"{results['leading'][seat] / max(results['unfinished'], 1):.1%} of unfinished games")
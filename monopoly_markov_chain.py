@@ -1,154 +1,50 @@
 """
 This program uses a Markov chain to determine how often each space on a Monopoly board is landed on.
 
-The program constructs a transition matrix and raises it to a high power to get a steady-state matrix, which shows
-the overall probability of landing on each space.
+The program constructs a transition matrix and finds its steady state, which shows the overall probability of landing
+on each space.
 
-The leave_jail_immediately variable determines if the player will immediately pay to leave jail, or if they will
-attempt to roll doubles to get out of jail for free.
-"""
-
-import numpy as np
-import itertools
-
-
-leave_jail_immediately = False
-
-
-def add_rolls():
-    """Adds rolls to the matrix, ignoring special movement of spaces like Go To Jail"""
-    for current_space in range(40):
-        for roll, probability in roll_no_doubles.items():
-            new_space = add_spaces(current_space, roll)
-            for doubles_state in doubles_states:
-                the_array[doubles_state(current_space)][new_space] += probability
-        for roll, probability in roll_doubles.items():
-            new_space = add_spaces(current_space, roll)
-            the_array[no_doubles(current_space)][one_doubles(new_space)] += probability
-            the_array[one_doubles(current_space)][two_doubles(new_space)] += probability
-            the_array[two_doubles(current_space)][jail_dict[0]] += probability
-
-
-def leave_jail():
-    """Adds the behavior of the three jail sates to the matrix"""
-    if leave_jail_immediately:
-        the_array[jail_dict[0]] = the_array[no_doubles(space_dict["Visiting Jail"])]
-    else:
-        for jail_state in jail_dict.values():
-            # If non-doubles are rolled, increments the jail state if in state 0 or 1, or moves normally if in state 2
-            if jail_state in (jail_dict[0], jail_dict[1]):
-                the_array[jail_state][jail_state + 1] += sum(roll_no_doubles.values())
-            else:
-                for roll, probability in roll_no_doubles.items():
-                    the_array[jail_state][add_spaces(space_dict["Visiting Jail"], roll)] += probability
-            # If doubles are rolled, moves the number of spaces shown from Visiting Jail on the no doubles state
-            for roll, probability in roll_doubles.items():
-                the_array[jail_state][no_doubles(add_spaces(space_dict["Visiting Jail"], roll))] += probability
-
-
-def add_chance_and_community_chest():
-    """Adds Chance and Community Chest behavior to the matrix"""
-    def find_nearest_utility(space):
-        space %= 40
-        if space_dict["Electric Company"] <= space < space_dict["Water Works"]:
-            return space_dict["Water Works"]
-        else:
-            return space_dict["Electric Company"]
-
-    def find_nearest_railroad(space):
-        space %= 40
-        railroads = (space_dict["Reading Railroad"], space_dict["Pennsylvania Railroad"], space_dict["B&O Railroad"],
-                     space_dict["Short Line"])
-        for i in range(3):
-            if railroads[i] <= space < railroads[i + 1]:
-                return railroads[i + 1]
-        else:
-            return space_dict["Reading Railroad"]
-
-    card_probability = 1 / 16
-    chance_spaces = (space_dict["Chance 1"], space_dict["Chance 2"], space_dict["Chance 3"])
-    community_chest_spaces = (space_dict["Community Chest 1"], space_dict["Community Chest 2"],
-                              space_dict["Community Chest 3"])
-
-    for space, doubles_state in itertools.product(range(120), doubles_states):
-
-        # Adds Chance behavior
-        for chance_space in chance_spaces:
-            # Finds probability of landing on the current chance space and then drawing a particular chance card
-            net_probability = the_array[space][doubles_state(chance_space)] * card_probability
-
-            for chance_card in (space_dict["Go"], space_dict["Illinois Avenue"], space_dict["St. Charles Place"],
-                                find_nearest_utility(chance_space), find_nearest_railroad(chance_space),
-                                find_nearest_railroad(chance_space), (chance_space - 3) % 40,
-                                space_dict["Reading Railroad"], space_dict["Boardwalk"]):
-
-                # Moves net_probability from ending the turn on the chance space to ending where the card puts you
-                the_array[space][doubles_state(chance_card)] += net_probability
-                the_array[space][doubles_state(chance_space)] -= net_probability
-            # Going to jail is handled separately because it goes to the same state regardless of current doubles state
-            the_array[space][jail_dict[0]] += net_probability
-            the_array[space][doubles_state(chance_space)] -= net_probability
-
-        # Adds Community Chest behavior
-        for community_chest_space in community_chest_spaces:
-            net_probability = the_array[space][doubles_state(community_chest_space)] * card_probability
-
-            the_array[space][doubles_state(space_dict["Go"])] += net_probability
-            the_array[space][doubles_state(community_chest_space)] -= net_probability
-
-            the_array[space][jail_dict[0]] += net_probability
-            the_array[space][doubles_state(community_chest_space)] -= net_probability
-
-
-def go_to_jail_space():
-    """Makes the 'Go To Jail' space actually send you to jail"""
-    jail_doubles_states = [doubles_state(space_dict["Go To Jail"]) for doubles_state in doubles_states]
-    for space, doubles_state, jail_doubles_state in itertools.product(range(40), doubles_states, jail_doubles_states):
-        the_array[doubles_state(space)][jail_dict[0]] += the_array[doubles_state(space)][jail_doubles_state]
-        the_array[doubles_state(space)][jail_doubles_state] = 0
-
-
-def print_results():
-    """Prints the results of the computation"""
-    results = {}
-    # Adds the three doubles states for each non-jail space together and puts the result in the results dict
-    for space_name, space_num in space_dict.items():
-        results.setdefault(space_name, 0)
-        for doubles_state in doubles_states:
-            results[space_name] += the_array[0][doubles_state(space_num)]
-        
-    # Adds the three in-jail states and put them in the dict
-    results["In Jail"] = sum(the_array[0][jail_dict[0]:jail_dict[2] + 1])
-
-    # Print the results in descending order
-    width = 30
-    print("|" + "Results".center(width, "=") + "|")
-    for space, probability in sorted(results.items(), key=lambda x: x[1], reverse=True):
-        print(f"|" + space.ljust(width-6, ".") + str(round(probability, 4)).ljust(6, "0") + "|")
-    print("|" + "=" * width + "|")
+A MarkovModel holds one set of rules: the board layout, the Chance and Community Chest cards, the dice, whether the
+player pays to leave jail immediately or tries to roll doubles, how many turns they can stay in jail, and how many
+doubles in a row send them to jail.  Each state is a space and the number of doubles just rolled, or a turn in jail.
+The matrix is built as a sparse matrix directly from arrays of every state, roll and card, and its stationary
+distribution is found by solving the linear system for it, by power iteration with a convergence check, or by
+squaring the matrix.
 
+Built matrices and stationary distributions are saved in a cache directory under a hash of the rules, so sweeping over
+many rule variants only builds and solves the variants that haven't been seen before:
 
-def add_spaces(*nums: int) -> int:
-    return sum(nums) % 40
+    python monopoly_markov_chain.py --solver direct
+    python monopoly_markov_chain.py --leave-jail-immediately --dice 6 6 6 --doubles-limit 2
+    python monopoly_markov_chain.py --sweep
 
+Real games only last a few dozen turns, so the chain can also give the distribution after each turn starting from Go,
+and the expected number of visits to each space over the first N turns.  With --per-turn, the distribution after
+each turn is written to stdout as CSV, and the visits table to stderr:
 
-# These three functions, while not strictly necessary, improve readability elsewhere in the program
-def no_doubles(space:int) -> int:
-    return space
-
-
-def one_doubles(space:int) -> int:
-    return space + 40
+    python monopoly_markov_chain.py --horizon 60 --per-turn > per_turn.csv
+"""
 
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+from time import perf_counter
 
-def two_doubles(space:int) -> int:
-    return space + 80
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import spsolve
 
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "monopoly_chain_cache")
 
-doubles_states = (no_doubles, one_doubles, two_doubles)
+# Part of every cache key.  Increase it whenever the way the matrix or its solutions are built, or the format they are
+# saved in, changes, so that files cached by older code are no longer used.
+CACHE_VERSION = 1
 
-# Builds a dictionary of space names and their respective integer values for code readability
-spaces = ["Go", "Mediterranean Avenue", "Community Chest 1", "Baltic Avenue",
+# The standard board, starting from Go
+SPACES = ("Go", "Mediterranean Avenue", "Community Chest 1", "Baltic Avenue",
           "Income Tax", "Reading Railroad", "Oriental Avenue", "Chance 1",
           "Vermont Avenue", "Connecticut Avenue", "Visiting Jail", "St. Charles Place",
           "Electric Company", "States Avenue", "Virginia Avenue", "Pennsylvania Railroad",
@@ -156,35 +52,395 @@ spaces = ["Go", "Mediterranean Avenue", "Community Chest 1", "Baltic Avenue",
           "Free Parking", "Kentucky Avenue", "Chance 2", "Indiana Avenue", "Illinois Avenue",
           "B&O Railroad", "Atlantic Avenue", "Ventnor Avenue", "Water Works", "Marvin Gardens",
           "Go To Jail", "Pacific Avenue", "North Carolina Avenue", "Community Chest 3",
-          "Pennsylvania Avenue", "Short Line", "Chance 3", "Park Place", "Luxury Tax", "Boardwalk"]
-space_dict = dict(zip(spaces, list(range(40))))
-
-# Builds a separate dictionary for the three In Jail states, which are usually handled separately
-jail_dict = {0: 120, 1: 121, 2: 122}
-
-the_array = np.zeros((123, 123))
-
-# Calculates the probability of every possible roll.  Used by both add_rolls and roll_to_leave_jail
-roll_no_doubles = {}
-roll_doubles = {}
-for die_1, die_2 in itertools.product(range(1, 7), range(1, 7)):
-    total = die_1 + die_2
-    if die_1 != die_2:
-        roll_no_doubles.setdefault(total, 0)
-        roll_no_doubles[total] += 1 / 36
-    else:
-        roll_doubles.setdefault(total, 0)
-        roll_doubles[total] += 1 / 36
+          "Pennsylvania Avenue", "Short Line", "Chance 3", "Park Place", "Luxury Tax", "Boardwalk")
+
+RAILROADS = ("Reading Railroad", "Pennsylvania Railroad", "B&O Railroad", "Short Line")
+UTILITIES = ("Electric Company", "Water Works")
+
+# The cards of each deck, drawn on every space whose name starts with the deck's name.  A card is the name of the
+# space it moves the player to ("Go To Jail" sends them to jail), ("nearest", space, ...) to move forward to the
+# nearest of several spaces, ("back", n) to move back n spaces, or None if it doesn't move the player
+DECKS = {
+    "Chance": ("Go", "Illinois Avenue", "St. Charles Place", ("nearest",) + UTILITIES, ("nearest",) + RAILROADS,
+               ("nearest",) + RAILROADS, ("back", 3), "Reading Railroad", "Boardwalk", "Go To Jail",
+               None, None, None, None, None, None),
+    "Community Chest": ("Go", "Go To Jail") + (None,) * 14,
+}
+
+# The models created in this process, by the hash of their rules, so each is only built and solved once per process
+loaded_models = {}
+
+
+def stationary_direct(matrix):
+    """Finds the stationary distribution by solving (P^T - I) pi = 0, with one equation replaced by sum(pi) = 1
+
+    Returns:
+        dict: The distribution over the states, the residual max|pi P - pi|, and the number of iterations (0)
+    """
+    size = matrix.shape[0]
+    system = (matrix.T - sparse.identity(size, format="csr")).tolil()
+    system[size - 1] = np.ones(size)
+    right_side = np.zeros(size)
+    right_side[size - 1] = 1
+    distribution = spsolve(system.tocsc(), right_side)
+    return {"distribution": distribution, "residual": residual(matrix, distribution), "iterations": 0}
+
+
+def stationary_power(matrix, tolerance=1e-12, max_iterations=100000):
+    """Finds the stationary distribution by repeatedly moving a distribution one turn, starting from Go, until it
+    stops changing
+
+    Arguments:
+        matrix: The transition matrix
+        tolerance: The largest change in any state's probability between iterations to stop at
+        max_iterations: The most iterations to run
+
+    Returns:
+        dict: The distribution over the states, the residual max|pi P - pi|, and the number of iterations run
+    """
+    transposed = matrix.T.tocsr()
+    distribution = np.zeros(matrix.shape[0])
+    distribution[0] = 1
+    for iteration in range(1, max_iterations + 1):
+        next_distribution = transposed @ distribution
+        change = np.abs(next_distribution - distribution).max()
+        distribution = next_distribution
+        if change < tolerance:
+            break
+    return {"distribution": distribution, "residual": residual(matrix, distribution), "iterations": iteration}
+
+
+def stationary_squaring(matrix, squarings=30):
+    """Finds the stationary distribution by squaring the dense matrix, starting from Go
+
+    Returns:
+        dict: The first row of the matrix raised to the power 2^squarings, the residual max|pi P - pi|, and the
+            number of squarings
+    """
+    power = matrix.toarray()
+    for i in range(squarings):
+        power = np.matmul(power, power)
+    return {"distribution": power[0], "residual": residual(matrix, power[0]), "iterations": squarings}
+
+
+SOLVERS = {"direct": stationary_direct, "power": stationary_power, "squaring": stationary_squaring}
+
+
+def residual(matrix, distribution):
+    """Returns how far a distribution is from being stationary, as max|pi P - pi|"""
+    return float(np.abs(matrix.T @ distribution - distribution).max())
+
+
+class MarkovModel:
+    """The Markov chain of a player moving around a Monopoly board under one set of rules
+
+    The states are each space with no doubles just rolled, then each space with one double just rolled, and so on up
+    to doubles_limit - 1, followed by one state for each turn in jail.  With the standard rules there are 123 states.
+
+    Arguments:
+        board: The name of every space, starting from Go.  It must include "Visiting Jail" and "Go To Jail".
+        decks: The cards of each deck, in the format of DECKS
+        dice: The number of sides of each die rolled
+        jail_immediately: Whether the player pays to leave jail immediately, rather than trying to roll doubles
+        jail_turns: The most turns the player stays in jail before paying to leave
+        doubles_limit: The number of doubles in a row that sends the player to jail
+        cache_dir: The directory to save built matrices and distributions in, or None to not save them
+    """
+    def __init__(self, board=SPACES, decks=DECKS, dice=(6, 6), jail_immediately=False, jail_turns=3, doubles_limit=3,
+                 cache_dir=DEFAULT_CACHE_DIR):
+        self.board = tuple(board)
+        self.decks = decks
+        self.dice = tuple(dice)
+        self.jail_immediately = jail_immediately
+        self.jail_turns = jail_turns
+        self.doubles_limit = doubles_limit
+        self.cache_dir = cache_dir
+
+        self.num_spaces = len(self.board)
+        self.space_dict = {name: space for space, name in enumerate(self.board)}
+        self.jail_state = self.num_spaces * doubles_limit
+        self.num_states = self.jail_state + jail_turns
+        key_data = {"version": CACHE_VERSION, **self.parameters()}
+        self.key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()[:16]
+        self.matrix = None
+        self.solutions = {}
+
+    def parameters(self):
+        """Returns the rules of the model as a dict that can be saved as JSON"""
+        return {"board": list(self.board), "decks": self.decks, "dice": list(self.dice),
+                "jail_immediately": self.jail_immediately, "jail_turns": self.jail_turns,
+                "doubles_limit": self.doubles_limit}
+
+    def card_destinations(self):
+        """Builds the table of where each card drawn on each space sends the player
+
+        Returns:
+            tuple: The space each card moves the player to, shaped (spaces, cards) with the number of spaces
+                standing for jail, and the probability of drawing each card there.  Spaces without a deck have a
+                single card that leaves the player where they are, and Go To Jail has one that sends them to jail.
+        """
+        num_cards = max([len(cards) for cards in self.decks.values()] + [1])
+        destinations = np.tile(np.arange(self.num_spaces)[:, None], (1, num_cards))
+        probabilities = np.zeros((self.num_spaces, num_cards))
+        probabilities[:, 0] = 1
+        for space, name in enumerate(self.board):
+            deck = next((cards for deck_name, cards in self.decks.items() if name.startswith(deck_name)), None)
+            if deck is None:
+                continue
+            probabilities[space] = 0
+            probabilities[space, :len(deck)] = 1 / len(deck)
+            for card_num, card in enumerate(deck):
+                if card is None:
+                    continue
+                if isinstance(card, str):
+                    destinations[space, card_num] = self.space_dict[card]
+                elif card[0] == "nearest":
+                    targets = [self.space_dict[target] for target in card[1:]]
+                    destinations[space, card_num] = min(targets, key=lambda target: (target - space) % self.num_spaces)
+                elif card[0] == "back":
+                    destinations[space, card_num] = (space - card[1]) % self.num_spaces
+        destinations[destinations == self.space_dict["Go To Jail"]] = self.num_spaces
+        return destinations, probabilities
+
+    def build_matrix(self):
+        """Builds the transition matrix from arrays of the outcome of every state, roll and card
+
+        Each roll of the dice is equally likely, as is each card in a deck.  A player paying to leave jail immediately
+        rolls as if they were on Visiting Jail.  A player trying to roll doubles leaves on doubles or on their last
+        turn in jail, moving from Visiting Jail without drawing a card, and otherwise stays for another turn.
+
+        Returns:
+            scipy.sparse.csr_matrix: The probability of moving from each state (row) to each state (column)
+        """
+        rolls = np.array(list(itertools.product(*[range(1, sides + 1) for sides in self.dice])))
+        destinations, card_probabilities = self.card_destinations()
+        num_spaces = self.num_spaces
+
+        state = np.arange(self.num_states)[:, None, None]
+        total = rolls.sum(axis=1)[None, :, None]
+        doubles = (rolls == rolls[:, :1]).all(axis=1)[None, :, None]
+        card = np.arange(destinations.shape[1])[None, None, :]
+        in_jail = state >= self.jail_state
+
+        # Moves the player from their space, or from Visiting Jail if they are leaving jail
+        start = np.where(in_jail, self.space_dict["Visiting Jail"], state % num_spaces)
+        doubles_rolled = np.where(in_jail, 0, state // num_spaces)
+        landed = (start + total) % num_spaces
+        space = destinations[landed, card]
+        moved = np.where(space == num_spaces, self.jail_state,
+                         space + num_spaces * np.where(doubles, doubles_rolled + 1, 0))
+        next_state = np.where(doubles & (doubles_rolled + 1 >= self.doubles_limit), self.jail_state, moved)
+        probabilities = card_probabilities[landed, card] / len(rolls)
+
+        if not self.jail_immediately:
+            leaving = doubles | (state == self.num_states - 1)
+            next_state = np.where(in_jail, np.where(leaving, landed, state + 1), next_state)
+
+        rows = np.broadcast_to(state, next_state.shape).ravel()
+        return sparse.csr_matrix((probabilities.ravel(), (rows, next_state.ravel())),
+                                 shape=(self.num_states, self.num_states))
+
+    def cache_path(self, name):
+        return os.path.join(self.cache_dir, f"{self.key}-{name}.npz")
+
+    def load(self, name):
+        """Reads an array file from the cache directory, returning None if it isn't there"""
+        if self.cache_dir is None or not os.path.exists(self.cache_path(name)):
+            return None
+        with np.load(self.cache_path(name)) as arrays:
+            return dict(arrays)
+
+    def save(self, name, **arrays):
+        """Writes arrays to a file in the cache directory, along with the rules they were built from"""
+        if self.cache_dir is None:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Writes to a temporary file first so that other processes never read a partly written cache
+        temp_path = f"{self.cache_path(name)}.{os.getpid()}.tmp.npz"
+        np.savez(temp_path, parameters=json.dumps(self.parameters()), **arrays)
+        os.replace(temp_path, self.cache_path(name))
+
+    def transition_matrix(self):
+        """Returns the transition matrix, building it only if it isn't already in memory or the cache"""
+        if self.matrix is None:
+            arrays = self.load("matrix")
+            if arrays is not None:
+                self.matrix = sparse.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]),
+                                                shape=(self.num_states, self.num_states))
+            else:
+                self.matrix = self.build_matrix()
+                self.save("matrix", data=self.matrix.data, indices=self.matrix.indices, indptr=self.matrix.indptr)
+        return self.matrix
+
+    def stationary(self, solver="direct"):
+        """Returns the stationary distribution, solving for it only if it isn't already in memory or the cache
+
+        Arguments:
+            solver: "direct", "power" or "squaring"
+
+        Returns:
+            dict: The distribution over the states, the residual max|pi P - pi|, and the number of iterations used
+        """
+        if solver not in self.solutions:
+            arrays = self.load(solver)
+            if arrays is not None:
+                solution = {"distribution": arrays["distribution"], "residual": float(arrays["residual"]),
+                            "iterations": int(arrays["iterations"])}
+            else:
+                solution = SOLVERS[solver](self.transition_matrix())
+                self.save(solver, **solution)
+            self.solutions[solver] = solution
+        return self.solutions[solver]
+
+    def turn_distributions(self, turns, start=None):
+        """Moves a distribution forward one turn at a time, yielding the distribution after each turn
+
+        Only the current distribution is kept, so long horizons take no more memory than short ones.
+
+        Arguments:
+            turns: The number of turns to move forward
+            start: The distribution to start from, shaped (states,), or (states, n) to move n distributions at once.
+                Defaults to starting on Go.
+
+        Yields:
+            tuple: The turn number, from 1 to turns, and the distribution over the states after that turn
+        """
+        transposed = self.transition_matrix().T.tocsr()
+        if start is None:
+            start = np.zeros(self.num_states)
+            start[0] = 1
+        distribution = np.asarray(start, dtype=float)
+        for turn in range(1, turns + 1):
+            distribution = transposed @ distribution
+            yield turn, distribution
+
+    def expected_visits(self, turns, start=None):
+        """Finds the expected number of turns ending in each state over the first turns turns
+
+        Arguments:
+            turns: The number of turns
+            start: The distribution to start from, as in turn_distributions
+
+        Returns:
+            numpy.ndarray: The expected visits to each state, the sum of the distributions after each turn
+        """
+        visits = np.zeros(self.num_states if start is None else np.shape(start))
+        for turn, distribution in self.turn_distributions(turns, start):
+            visits = visits + distribution
+        return visits
+
+    def space_frequencies(self, distribution):
+        """Adds up the probability of each space over its doubles states, with the jail states as "In Jail"
+
+        This also works for anything else that adds up over the states, like expected visits.
+
+        Arguments:
+            distribution: The probability of each state, shaped (states,), or (states, n) for n distributions at once
+                like those from turn_distributions
+
+        Returns:
+            dict: The probability of each space name, as a float, or as an array of n probabilities for n
+                distributions
+        """
+        distribution = np.asarray(distribution)
+        by_space = distribution[:self.jail_state].reshape(self.doubles_limit, self.num_spaces, -1).sum(axis=0)
+        in_jail = distribution[self.jail_state:].sum(axis=0)
+        if distribution.ndim == 1:
+            results = dict(zip(self.board, by_space[:, 0].tolist()))
+            results["In Jail"] = float(in_jail)
+        else:
+            results = dict(zip(self.board, by_space))
+            results["In Jail"] = in_jail
+        return results
 
-# Runs each of the functions to add space behavior to the array
-add_rolls()
-leave_jail()
-add_chance_and_community_chest()
-go_to_jail_space()
 
-# Raises the array to a large power
-for i in range(30):
-    the_array = np.matmul(the_array, the_array)
+def load_model(**rules):
+    """Returns the MarkovModel for a set of rules, creating it only the first time it is asked for in each process
 
-# Prints the results
-print_results()
+    Arguments:
+        rules: The arguments of MarkovModel
+    """
+    model = MarkovModel(**rules)
+    key = (model.key, model.cache_dir)
+    if key not in loaded_models:
+        loaded_models[key] = model
+    return loaded_models[key]
+
+
+def print_results(results, file=sys.stdout):
+    """Prints the results of the computation
+
+    Arguments:
+        results: The probability of each space, as returned by MarkovModel.space_frequencies
+        file: The file to print them to
+    """
+    # Print the results in descending order
+    width = 30
+    print("|" + "Results".center(width, "=") + "|", file=file)
+    for space, probability in sorted(results.items(), key=lambda x: x[1], reverse=True):
+        print(f"|" + space.ljust(width-6, ".") + str(round(probability, 4)).ljust(6, "0") + "|", file=file)
+    print("|" + "=" * width + "|", file=file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find how often each Monopoly space is landed on with a Markov chain.")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="direct",
+                        help="solve the linear system, iterate until converged, or square the dense matrix")
+    parser.add_argument("--leave-jail-immediately", action="store_true", help="pay to leave jail immediately")
+    parser.add_argument("--dice", type=int, nargs="+", default=[6, 6], help="number of sides of each die")
+    parser.add_argument("--jail-turns", type=int, default=3, help="most turns spent in jail")
+    parser.add_argument("--doubles-limit", type=int, default=3, help="doubles in a row that send the player to jail")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="directory to cache matrices in")
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write the cache")
+    parser.add_argument("--horizon", type=int, metavar="TURNS",
+                        help="instead find the expected visits to each space in this many turns from Go")
+    parser.add_argument("--per-turn", action="store_true",
+                        help="with --horizon, also print the probability of each space after every turn as CSV, "
+                             "with the visits table on stderr")
+    parser.add_argument("--sweep", action="store_true",
+                        help="solve every combination of dice, jail policy, jail turns and doubles limit instead")
+    args = parser.parse_args()
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.horizon is not None and args.horizon < 1:
+        parser.error("--horizon needs at least 1 turn")
+
+    if args.horizon is not None:
+        model = load_model(dice=args.dice, jail_immediately=args.leave_jail_immediately, jail_turns=args.jail_turns,
+                           doubles_limit=args.doubles_limit, cache_dir=cache_dir)
+        start_time = perf_counter()
+        if args.per_turn:
+            # Prints each turn as soon as it is found, and adds up the visits along the way
+            visits = 0
+            print("Turn," + ",".join(f'"{name}"' for name in model.space_frequencies(np.zeros(model.num_states))))
+            for turn, distribution in model.turn_distributions(args.horizon):
+                visits = visits + distribution
+                print(f"{turn}," + ",".join(f"{value:.6f}" for value in model.space_frequencies(distribution).values()))
+        else:
+            visits = model.expected_visits(args.horizon)
+        elapsed = perf_counter() - start_time
+
+        # The CSV has stdout to itself
+        results_file = sys.stderr if args.per_turn else sys.stdout
+        print_results(model.space_frequencies(visits), results_file)
+        print(f"Expected visits over {args.horizon} turns from Go, found in {elapsed * 1000:.1f} ms", file=results_file)
+    elif args.sweep:
+        variants = list(itertools.product([(4, 4), (6, 6), (8, 8), (6, 6, 6)], [False, True], [1, 2, 3, 4],
+                                          [1, 2, 3, 4]))
+        start_time = perf_counter()
+        for dice, jail_immediately, jail_turns, doubles_limit in variants:
+            model = load_model(dice=dice, jail_immediately=jail_immediately, jail_turns=jail_turns,
+                               doubles_limit=doubles_limit, cache_dir=cache_dir)
+            in_jail = model.space_frequencies(model.stationary(args.solver)["distribution"])["In Jail"]
+            print(f"dice {str(dice):<10} leave immediately {jail_immediately!s:<6} jail turns {jail_turns} "
+                  f"doubles limit {doubles_limit}: In Jail {in_jail:.4f}")
+        print(f"Solved {len(variants)} variants in {perf_counter() - start_time:.2f}s")
+    else:
+        start_time = perf_counter()
+        model = load_model(dice=args.dice, jail_immediately=args.leave_jail_immediately, jail_turns=args.jail_turns,
+                           doubles_limit=args.doubles_limit, cache_dir=cache_dir)
+        solution = model.stationary(args.solver)
+        elapsed = perf_counter() - start_time
+
+        print_results(model.space_frequencies(solution["distribution"]))
+        print(f"Solved in {elapsed * 1000:.1f} ms with {solution['iterations']} iterations, "
+              f"residual {solution['residual']:.2e}")
@@ -0,0 +1,136 @@
+"""
+This program uses the steady state of the Markov chain in monopoly_markov_chain.py to find how much rent each Monopoly
+property, color group and build level is expected to earn, and how long it takes to pay for itself.
+
+The expected rent of a property at a build level is the probability of an opponent's roll ending on it times its rent
+at that level.  The rents and prices come from monopoly_game.py.  Streets have seven build levels: unimproved,
+unimproved with the whole color group (double rent), 1 to 4 houses and a hotel.  For railroads and utilities the level
+is how many of them the owner has.  Utility rent uses the average dice total.
+
+Every property and level is evaluated at once by multiplying the landing probabilities with rent tables, and many sets
+of landing probabilities can be evaluated in one call, so a strategy optimizer can score thousands of them a second:
+
+    python monopoly_rent.py --opponents 3
+    python monopoly_rent.py --leave-jail-immediately --benchmark 10000
+"""
+
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from monopoly_game import (COLOR_GROUPS, HOUSE_COSTS, PRICES, RAILROAD, RAILROADS, RENTS, ROLL_TOTALS, SPACE_KINDS,
+                           STREET, UTILITIES, UTILITY)
+from monopoly_markov_chain import load_model
+from monopoly_simulation import spaces, space_to_num
+
+LEVELS = 7
+STREET_LEVELS = ("Unimproved", "Monopoly", "1 House", "2 Houses", "3 Houses", "4 Houses", "Hotel")
+GROUP_NAMES = ("Brown", "Light Blue", "Pink", "Orange", "Red", "Yellow", "Green", "Dark Blue", "Railroads",
+               "Utilities")
+
+# The rent and total cost of each space at each level, and which levels each space has
+RENT_TABLE = np.zeros((40, LEVELS))
+INVESTMENTS = np.zeros((40, LEVELS))
+VALID_LEVELS = np.zeros((40, LEVELS), dtype=bool)
+streets = np.nonzero(SPACE_KINDS == STREET)[0]
+RENT_TABLE[streets, 0] = RENTS[streets, 0]
+RENT_TABLE[streets, 1] = 2 * RENTS[streets, 0]
+RENT_TABLE[streets, 2:] = RENTS[streets, 1:]
+INVESTMENTS[streets] = PRICES[streets, None] + HOUSE_COSTS[streets, None] * np.maximum(np.arange(LEVELS) - 1, 0)
+VALID_LEVELS[streets] = True
+RENT_TABLE[RAILROADS, :4] = 25 << np.arange(4)
+RENT_TABLE[UTILITIES, :2] = np.array([4, 10]) * ROLL_TOTALS.mean()
+for kind, num_levels in ((RAILROAD, 4), (UTILITY, 2)):
+    INVESTMENTS[SPACE_KINDS == kind, :num_levels] = PRICES[SPACE_KINDS == kind, None]
+    VALID_LEVELS[SPACE_KINDS == kind, :num_levels] = True
+
+# How much each space counts toward each group at each level.  A color group is all of its streets built to the same
+# level.  Owning n of the railroads or utilities counts each of them n / (number in the set) times, the average over
+# which ones are owned.
+GROUP_WEIGHTS = np.zeros((40, len(GROUP_NAMES), LEVELS))
+for group, names in enumerate(COLOR_GROUPS):
+    GROUP_WEIGHTS[[space_to_num[name] for name in names], group] = 1
+for group, members in ((8, RAILROADS), (9, UTILITIES)):
+    GROUP_WEIGHTS[members, group, :len(members)] = (np.arange(len(members)) + 1) / len(members)
+VALID_GROUP_LEVELS = GROUP_WEIGHTS.sum(axis=0) > 0
+GROUP_INVESTMENTS = np.einsum("sl,sgl->gl", INVESTMENTS, GROUP_WEIGHTS)
+
+
+def landing_probabilities(jail_immediately=False, solver="direct"):
+    """Finds the probability of each roll ending on each space, from the steady state of the standard Markov chain
+
+    Returns:
+        numpy.ndarray: The probability of each of the 40 spaces, not counting being in jail as Visiting Jail
+    """
+    model = load_model(jail_immediately=jail_immediately)
+    distribution = model.stationary(solver)["distribution"]
+    return distribution[:model.jail_state].reshape(model.doubles_limit, model.num_spaces).sum(axis=0)
+
+
+def rent_analytics(probabilities, opponents=3):
+    """Finds the expected rent and break-even time of every property and group at every level
+
+    Arguments:
+        probabilities: The probability of a roll ending on each space, shaped (40,), or (..., 40) to evaluate many
+            sets of landing probabilities at once
+        opponents: The number of opponents rolling
+
+    Returns:
+        dict: Arrays of the expected rent per opponent roll ("income"), the cost ("investment"), the fraction of the
+            cost earned back each round of opponent rolls ("return") and the number of rounds to earn it all back
+            ("break_even") of each space at each level, shaped (..., 40, 7), and the same for each group, shaped
+            (..., 10, 7) with keys starting "group_".  Levels a space or group doesn't have are NaN.
+    """
+    income = np.asarray(probabilities)[..., :, None] * RENT_TABLE
+    group_income = np.einsum("...sl,sgl->...gl", income, GROUP_WEIGHTS)
+    results = {}
+    for prefix, earned, investment, valid in (("", income, INVESTMENTS, VALID_LEVELS),
+                                              ("group_", group_income, GROUP_INVESTMENTS, VALID_GROUP_LEVELS)):
+        round_income = earned * opponents
+        results[prefix + "income"] = np.where(valid, earned, np.nan)
+        results[prefix + "investment"] = np.where(valid, investment, np.nan)
+        results[prefix + "return"] = np.where(valid, round_income / np.where(valid, investment, 1), np.nan)
+        results[prefix + "break_even"] = np.where(valid & (round_income > 0),
+                                                  investment / np.where(round_income > 0, round_income, 1), np.nan)
+    return results
+
+
+def print_table(title, names, values, level_names, number_format):
+    """Prints one value for each row and level, leaving out levels that don't apply"""
+    print(f"{title:<24}" + "".join(f"{level:>11}" for level in level_names))
+    for name, row in zip(names, values):
+        print(f"{name:<24}" + "".join(f"{value:>11{number_format}}" if not np.isnan(value) else f"{'-':>11}"
+                                      for value in row))
+    print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the expected rent and break-even time of Monopoly properties.")
+    parser.add_argument("--leave-jail-immediately", action="store_true", help="opponents pay to leave jail immediately")
+    parser.add_argument("--opponents", type=int, default=3, help="number of opponents")
+    parser.add_argument("--benchmark", type=int, metavar="CALLS",
+                        help="instead time this many single calls and one batched call of the same size")
+    args = parser.parse_args()
+
+    probabilities = landing_probabilities(args.leave_jail_immediately)
+    if args.benchmark:
+        start_time = perf_counter()
+        for i in range(args.benchmark):
+            rent_analytics(probabilities, args.opponents)
+        single_rate = args.benchmark / (perf_counter() - start_time)
+        batch = probabilities * np.random.default_rng(0).uniform(0.9, 1.1, (args.benchmark, 40))
+        start_time = perf_counter()
+        rent_analytics(batch, args.opponents)
+        batch_rate = args.benchmark / (perf_counter() - start_time)
+        print(f"{single_rate:,.0f} evaluations/sec one at a time, {batch_rate:,.0f} evaluations/sec batched")
+    else:
+        results = rent_analytics(probabilities, args.opponents)
+        properties = np.nonzero(VALID_LEVELS.any(axis=1))[0]
+        names = [spaces[space] for space in properties]
+        level_names = STREET_LEVELS
+        print_table("Rent per opponent roll", names, results["income"][properties], level_names, ".2f")
+        print_table("Rounds to break even", names, results["break_even"][properties], level_names, ".0f")
+        print_table("Group rent per roll", GROUP_NAMES, results["group_income"], level_names, ".2f")
+        print_table("Group rounds to break even", GROUP_NAMES, results["group_break_even"], level_names, ".0f")
+        print("Railroad and utility levels are the number owned, starting from 1.")
@@ -5,14 +5,66 @@ on.
 num_turns determines the number of turns that will be simulated.
 leave_jail_immediately determines if the player will pay to leave jail immediately or if they will attempt to roll
 doubles to leave jail.
+
+The vectorized engine moves many independent players at once with NumPy, with the same rules as take_turn, which is
+fast enough to simulate hundreds of millions of turns:
+
+    python monopoly_simulation.py --turns 100000000 --vectorized --walkers 100000 --seed 1
+
+Long runs can be split into independently seeded shards run across every core, which reports the standard error of
+each frequency and can stop as soon as every one is within a tolerance:
+
+    python monopoly_simulation.py --turns 10000000000 --parallel --tolerance 0.00002 --seed 1
+
+take_turn draws each card at random with replacement.  With --real-decks, the vectorized engines instead give every
+player real shuffled Chance and Community Chest decks, with their Get Out of Jail Free cards, to measure how much
+that assumption changes the results.
 """
 
+import argparse
+import math
 import random
+from multiprocessing import Pool
+from time import perf_counter
+
+import numpy as np
 
 num_turns = 1000000
 leave_jail_immediately = False
 
 
+def find_nearest_utility(space):
+    if space_to_num["Electric Company"] <= space < space_to_num["Water Works"]:
+        return space_to_num["Water Works"]
+    else:
+        return space_to_num["Electric Company"]
+
+
+def find_nearest_railroad(space):
+    railroads = (space_to_num["Reading Railroad"], space_to_num["Pennsylvania Railroad"],
+                 space_to_num["B&O Railroad"], space_to_num["Short Line"])
+    for i in range(3):
+        if railroads[i] <= space < railroads[i + 1]:
+            return railroads[i+1]
+    else:
+        return space_to_num["Reading Railroad"]
+
+
+def build_deck(space):
+    """Returns the 16 cards of the deck drawn from on a Chance or Community Chest space, as the space each card
+    moves the player to, or None for cards that don't move the player"""
+    if space in chance_spaces:
+        deck = [space_to_num["Go"], space_to_num["Illinois Avenue"], space_to_num["St. Charles Place"],
+                find_nearest_utility(space), find_nearest_railroad(space),
+                find_nearest_railroad(space), space - 3, space_to_num["Reading Railroad"],
+                space_to_num["Boardwalk"], space_to_num["In Jail"]]
+    else:
+        deck = [space_to_num["Go"], space_to_num["In Jail"]]
+    while len(deck) < 16:
+        deck.append(None)
+    return deck
+
+
 def take_turn():
     """Simulates the player rolling the dice and moving to the appropriate space"""
     def roll_dice():
@@ -22,27 +74,14 @@ def take_turn():
         global current_space
         current_space = (current_space + sum(roll)) % 40
 
-    def find_nearest_utility(space):
-        if space_to_num["Electric Company"] <= space < space_to_num["Water Works"]:
-            return space_to_num["Water Works"]
-        else:
-            return space_to_num["Electric Company"]
-
-    def find_nearest_railroad(space):
-        railroads = (space_to_num["Reading Railroad"], space_to_num["Pennsylvania Railroad"],
-                     space_to_num["B&O Railroad"], space_to_num["Short Line"])
-        for i in range(3):
-            if railroads[i] <= space < railroads[i + 1]:
-                return railroads[i+1]
-        else:
-            return space_to_num["Reading Railroad"]
-
     global current_space, jail_rolls, num_doubles
     roll = roll_dice()
 
     # Handles rolling to leave jail
     if current_space == space_to_num["In Jail"] and not leave_jail_immediately:
         if jail_rolls == 2 or roll[0] == roll[1]:
+            # The player leaves from the jail square itself, which is where Visiting Jail is
+            current_space = space_to_num["Visiting Jail"]
             move(roll)
             jail_rolls = 0
         else:
@@ -68,33 +107,33 @@ def take_turn():
 
         # Handles landing on Chance and Community Chest spaces
         if (current_space in chance_spaces) or (current_space in community_chest_spaces):
-            # Builds the appropriate deck
-            if current_space in chance_spaces:
-                deck = [space_to_num["Go"], space_to_num["Illinois Avenue"], space_to_num["St. Charles Place"],
-                        find_nearest_utility(current_space), find_nearest_railroad(current_space),
-                        find_nearest_railroad(current_space), current_space - 3, space_to_num["Reading Railroad"],
-                        space_to_num["Boardwalk"], space_to_num["In Jail"]]
-            else:
-                deck = [space_to_num["Go"], space_to_num["In Jail"]]
-            while len(deck) < 16:
-                deck.append(None)
-
             # Chooses a card and moves to the appropriate space
-            card = random.choice(deck)
-            if card:
+            card = random.choice(build_deck(current_space))
+            if card is not None:
                 current_space = card
 
         # Sends the player to jail if they land on "Go To Jail"
         elif current_space == space_to_num["Go To Jail"]:
             current_space = space_to_num["In Jail"]
 
+        # Going to jail ends the player's run of doubles
+        if current_space == space_to_num["In Jail"]:
+            num_doubles = 0
+
+
+def print_results(standard_errors=None):
+    """ Prints the results of the simulation in an easily readable format
 
-def print_results():
-    """ Prints the results of the simulation in an easily readable format"""
-    width = 30
+    Arguments:
+        standard_errors: The standard error of each space's frequency, by space name, which is printed beside it
+    """
+    width = 30 if standard_errors is None else 40
     print("|" + "RESULTS".center(width, "=") + "|")
     for space, probability in sorted(counter.items(), key=lambda x: x[1], reverse=True):
-        print("|" + space.ljust(width - 6, ".") + str(round(probability / num_turns, 4)).ljust(6, "0") + "|")
+        line = space.ljust(30 - 6, ".") + str(round(probability / num_turns, 4)).ljust(6, "0")
+        if standard_errors is not None:
+            line += f" ± {standard_errors[space]:.5f}"
+        print("|" + line.ljust(width) + "|")
     print("|" + "=" * width + "|")
 
 
@@ -115,15 +154,405 @@ num_to_space = dict(zip(range(41), spaces))
 chance_spaces = [space_to_num[f"Chance {i}"] for i in range(1, 4)]
 community_chest_spaces = [space_to_num[f"Community Chest {i}"] for i in range(1,4)]
 
-# Builds a dictionary to keep track of how many times each space has been landed on
-counter = dict(zip(spaces, [0 for i in range(len(spaces))]))
-num_doubles = 0
-jail_rolls = 0
+# The vectorized engine tracks each player as one of 123 states, in the same layout as monopoly_markov_chain.py: the
+# space they are on plus 40 times the number of doubles they have just rolled, or 120 plus the number of turns they
+# have already spent in jail
+NUM_STATES = 123
+JAIL_STATE = 120
+
+
+def state_space(state):
+    """Returns the space a player in a state is on"""
+    return space_to_num["In Jail"] if state >= JAIL_STATE else state % 40
+
+
+def next_state(state, die_1, die_2, card, jail_immediately):
+    """Applies the rules of take_turn to one player in a state, for a given roll and card
+
+    Arguments:
+        state: The player's state at the start of the turn
+        die_1: The first die
+        die_2: The second die
+        card: The position in the deck of the card drawn if the player lands on Chance or Community Chest
+        jail_immediately: Whether the player pays to leave jail immediately
+
+    Returns:
+        int: The player's state at the end of the turn
+    """
+    doubles = die_1 == die_2
+    if state >= JAIL_STATE and not jail_immediately:
+        # Players in jail leave on doubles or on their third try, without drawing a card, and otherwise stay
+        if doubles or state == JAIL_STATE + 2:
+            return space_to_num["Visiting Jail"] + die_1 + die_2
+        return state + 1
+
+    if state >= JAIL_STATE:
+        state = space_to_num["Visiting Jail"]
+    doubles_rolled = state // 40
+    if doubles and doubles_rolled == 2:
+        return JAIL_STATE
+    space = (state % 40 + die_1 + die_2) % 40
+    if space in chance_spaces or space in community_chest_spaces:
+        destination = build_deck(space)[card]
+        if destination is not None:
+            space = destination
+    elif space == space_to_num["Go To Jail"]:
+        space = space_to_num["In Jail"]
+    if space == space_to_num["In Jail"]:
+        return JAIL_STATE
+    return space + 40 * (doubles_rolled + 1 if doubles else 0)
+
+
+def transition_table(jail_immediately):
+    """Builds the table of each state's next state for each of the 36 rolls and 16 cards
+
+    Returns:
+        numpy.ndarray: The next state, indexed by state * 576 + roll * 16 + card, where roll is 6 times the first die
+            plus the second die, counting from 0
+    """
+    table = np.zeros((NUM_STATES, 36, 16), dtype=np.int8)
+    for state in range(NUM_STATES):
+        for roll in range(36):
+            for card in range(16):
+                table[state, roll, card] = next_state(state, roll // 6 + 1, roll % 6 + 1, card, jail_immediately)
+    return table.reshape(-1)
+
+
+# The transition table for each jail policy, built the first time it is needed
+transition_tables = {}
+
+# The space each state is on, for folding state counts into space counts
+STATE_SPACES = np.array([state_space(state) for state in range(NUM_STATES)])
+
+
+def simulate_vectorized(turns, walkers=100000, jail_immediately=False, rng=None, warmup_turns=0):
+    """Simulates many independent players at once, each taking the same number of turns, with the rules of take_turn
+
+    Every roll and card draw is made with a single random number from 0 to 575 per player, and each player's whole
+    turn is a lookup in a table of next states, so a turn for every player is one gather and one bincount.
+
+    Arguments:
+        turns: The total number of turns to simulate, which is split evenly between the players
+        walkers: The number of players moved at once
+        jail_immediately: Whether players pay to leave jail immediately
+        rng: A numpy.random.Generator.  Defaults to a new unseeded generator.
+        warmup_turns: The number of turns each player takes before turns are counted, so that short runs aren't
+            biased toward the spaces near Go
+
+    Returns:
+        numpy.ndarray: The number of turns ended on each of the 41 spaces, in the order of spaces
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    walkers = max(min(walkers, turns), 1)
+    if jail_immediately not in transition_tables:
+        transition_tables[jail_immediately] = transition_table(jail_immediately)
+    table = transition_tables[jail_immediately]
+
+    state = np.zeros(walkers, dtype=np.int32)
+    for i in range(warmup_turns):
+        state = table[rng.integers(0, 576, walkers, dtype=np.int32) + state * 576].astype(np.int32)
+    state_counts = np.zeros(NUM_STATES, dtype=np.int64)
+    for turn_start in range(0, turns, walkers):
+        active = min(walkers, turns - turn_start)
+        if active < walkers:
+            state = state[:active]
+        outcome = rng.integers(0, 576, active, dtype=np.int32)
+        outcome += state * 576
+        state = table[outcome].astype(np.int32)
+        state_counts += np.bincount(state, minlength=NUM_STATES)
+    return np.bincount(STATE_SPACES, weights=state_counts, minlength=41).astype(np.int64)
+
+
+# The deck drawn from on each kind of card space, and the position in each deck of its Get Out of Jail Free card, which
+# is one of the cards that doesn't move the player
+CHANCE, COMMUNITY_CHEST = range(2)
+GET_OUT_OF_JAIL_FREE = 15
+
+# The deck each state draws from for each jail policy and roll, built the first time it is needed
+landing_tables = {}
+
+
+def deck_landed_on(state, die_1, die_2, jail_immediately):
+    """Returns the deck a player in a state draws a card from for a given roll, or None if they don't draw one"""
+    if state >= JAIL_STATE and not jail_immediately:
+        return None
+    if state >= JAIL_STATE:
+        state = space_to_num["Visiting Jail"]
+    if die_1 == die_2 and state // 40 == 2:
+        return None
+    space = (state % 40 + die_1 + die_2) % 40
+    if space in chance_spaces:
+        return CHANCE
+    if space in community_chest_spaces:
+        return COMMUNITY_CHEST
+    return None
+
+
+def landing_table(jail_immediately):
+    """Builds the table of the deck each state draws from for each of the 36 rolls, or -1 for no deck
+
+    Returns:
+        numpy.ndarray: The deck, indexed by state * 36 + roll, in the same order as transition_table
+    """
+    table = np.full((NUM_STATES, 36), -1, dtype=np.int8)
+    for state in range(NUM_STATES):
+        for roll in range(36):
+            deck = deck_landed_on(state, roll // 6 + 1, roll % 6 + 1, jail_immediately)
+            if deck is not None:
+                table[state, roll] = deck
+    return table.reshape(-1)
+
+
+def shuffle_decks(decks, pointers, held, rows, rng):
+    """Reshuffles one kind of deck for the given players, leaving out the Get Out of Jail Free card if it is held
+
+    Arguments:
+        decks: The order of each player's deck, shaped (players, 16)
+        pointers: The position of the next card to draw in each player's deck
+        held: Whether each player holds the deck's Get Out of Jail Free card
+        rows: The players whose decks are reshuffled
+        rng: A numpy.random.Generator
+    """
+    order = np.argsort(rng.random((len(rows), 16)), axis=1).astype(np.int8)
+    # A held card is moved to the top of the deck and counted as already drawn
+    holding = np.nonzero(held[rows])[0]
+    if len(holding):
+        slot = np.argmax(order[holding] == GET_OUT_OF_JAIL_FREE, axis=1)
+        order[holding, slot] = order[holding, 0]
+        order[holding, 0] = GET_OUT_OF_JAIL_FREE
+    decks[rows] = order
+    pointers[rows] = held[rows]
+
+
+def draw_cards(decks, pointers, held, rows, rng):
+    """Draws the next card of one kind of deck for the given players, reshuffling the decks that have run out
+
+    Returns:
+        numpy.ndarray: The position in the deck of each card drawn
+    """
+    exhausted = rows[pointers[rows] == 16]
+    if len(exhausted):
+        shuffle_decks(decks, pointers, held, exhausted, rng)
+    cards = decks[rows, pointers[rows]]
+    pointers[rows] += 1
+    held[rows[cards == GET_OUT_OF_JAIL_FREE]] = True
+    return cards
+
+
+def return_card(decks, pointers, held, rows):
+    """Puts the Get Out of Jail Free card of one kind of deck back at the bottom of the given players' decks"""
+    index = np.arange(16)
+    previous = pointers[rows][:, None] - 1
+    shifted = np.where((index >= previous) & (index < 15), index + 1, index)
+    decks[rows] = np.take_along_axis(decks[rows], shifted, axis=1)
+    decks[rows, 15] = GET_OUT_OF_JAIL_FREE
+    pointers[rows] -= 1
+    held[rows] = False
+
+
+def simulate_decks(turns, walkers=100000, jail_immediately=False, rng=None, warmup_turns=0):
+    """Simulates many independent players at once like simulate_vectorized, but with real shuffled decks
+
+    Each player has their own Chance and Community Chest decks, stored as arrays of card positions with a pointer to
+    the next card.  Cards are drawn in order and each deck is reshuffled once it runs out.  A drawn Get Out of Jail
+    Free card is kept out of its deck until the player is next in jail, when they use it to leave straight away and
+    it goes back to the bottom of the deck.
+
+    Arguments:
+        turns: The total number of turns to simulate, which is split evenly between the players
+        walkers: The number of players moved at once
+        jail_immediately: Whether players pay to leave jail immediately
+        rng: A numpy.random.Generator.  Defaults to a new unseeded generator.
+        warmup_turns: The number of turns each player takes before turns are counted
+
+    Returns:
+        numpy.ndarray: The number of turns ended on each of the 41 spaces, in the order of spaces
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    walkers = max(min(walkers, turns), 1)
+    for policy in {jail_immediately, True}:
+        if policy not in transition_tables:
+            transition_tables[policy] = transition_table(policy)
+        if policy not in landing_tables:
+            landing_tables[policy] = landing_table(policy)
+    table, landings = transition_tables[jail_immediately], landing_tables[jail_immediately]
+    # Players using a card to leave jail move as if they had paid to leave immediately
+    card_table, card_landings = transition_tables[True], landing_tables[True]
+
+    state = np.zeros(walkers, dtype=np.int32)
+    decks = np.zeros((2, walkers, 16), dtype=np.int8)
+    pointers = np.zeros((2, walkers), dtype=np.int8)
+    held = np.zeros((2, walkers), dtype=bool)
+    for deck in range(2):
+        shuffle_decks(decks[deck], pointers[deck], held[deck], np.arange(walkers), rng)
+
+    state_counts = np.zeros(NUM_STATES, dtype=np.int64)
+    for step in range(-warmup_turns, math.ceil(turns / walkers)):
+        active = walkers if step < 0 else min(walkers, turns - step * walkers)
+        if active < walkers:
+            state, decks, pointers, held = state[:active], decks[:, :active], pointers[:, :active], held[:, :active]
+        roll_index = state * 36 + rng.integers(0, 36, active, dtype=np.int32)
+        deck_drawn = landings[roll_index]
+
+        # Players in jail use a held card, Chance first, to leave
+        using = np.nonzero((state >= JAIL_STATE) & (held[CHANCE] | held[COMMUNITY_CHEST]))[0]
+        if len(using):
+            chance_users = held[CHANCE, using]
+            return_card(decks[CHANCE], pointers[CHANCE], held[CHANCE], using[chance_users])
+            return_card(decks[COMMUNITY_CHEST], pointers[COMMUNITY_CHEST], held[COMMUNITY_CHEST],
+                        using[~chance_users])
+            deck_drawn[using] = card_landings[roll_index[using]]
+
+        cards = np.zeros(active, dtype=np.int32)
+        for deck in range(2):
+            rows = np.nonzero(deck_drawn == deck)[0]
+            if len(rows):
+                cards[rows] = draw_cards(decks[deck], pointers[deck], held[deck], rows, rng)
+
+        outcome = roll_index * 16 + cards
+        new_state = table[outcome]
+        if len(using):
+            new_state[using] = card_table[outcome[using]]
+        state = new_state.astype(np.int32)
+        if step >= 0:
+            state_counts += np.bincount(state, minlength=NUM_STATES)
+    return np.bincount(STATE_SPACES, weights=state_counts, minlength=41).astype(np.int64)
+
+
+def simulate_shard(seed_sequence, turns, walkers, jail_immediately, warmup_turns, real_decks=False):
+    """Runs one shard of a sharded simulation with its own random number stream.  This is the work done by each
+    worker process."""
+    simulate = simulate_decks if real_decks else simulate_vectorized
+    return simulate(turns, walkers, jail_immediately, np.random.default_rng(seed_sequence), warmup_turns)
+
+
+def simulate_sharded(max_turns, shard_turns=10000000, seed=None, workers=None, tolerance=None, shards_per_round=8,
+                     walkers=10000, jail_immediately=False, warmup_turns=20, real_decks=False):
+    """Splits a vectorized simulation into independently seeded shards and runs them across a pool of processes
+
+    Each shard gets its own random number stream spawned from the master seed, so a given seed always produces the
+    same result no matter how many workers are used.  Shards are run in rounds, and after each round the standard error
+    of every space's frequency is estimated from the spread between shards.  The run stops early once every standard
+    error is within the tolerance.
+
+    Arguments:
+        max_turns: The most turns to simulate, at least 1
+        shard_turns: The number of turns in each shard, at least 1.  The last shard runs whatever is left over, and a run shorter
+            than two shards is split into two halves so that the spread between shards can still be measured.
+        seed: The master seed
+        workers: The number of worker processes.  Defaults to one per CPU, and 1 runs every shard in this process.
+        tolerance: The standard error every space's frequency must be within to stop early.  Defaults to running
+            every turn.
+        shards_per_round: The number of shards run between checks of the tolerance
+        walkers: The number of players moved at once in each shard
+        jail_immediately: Whether players pay to leave jail immediately
+        warmup_turns: The number of turns each player takes before its shard starts counting
+        real_decks: Whether to simulate with real shuffled decks, using simulate_decks
+
+    Returns:
+        dict: The merged visit counts of each space, the number of turns and shards run, each space's frequency and
+            its standard error, and whether the tolerance was reached
+    """
+    if max_turns < 1 or shard_turns < 1:
+        raise ValueError("A sharded simulation needs at least one turn, in shards of at least one turn")
+    num_shards = math.ceil(max_turns / shard_turns)
+    if num_shards < 2 <= max_turns:
+        num_shards = 2
+        shard_turns = math.ceil(max_turns / 2)
+    turns = [min(shard_turns, max_turns - shard * shard_turns) for shard in range(num_shards)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(num_shards)
+    shard_counts = []
+    pool = Pool(workers) if workers != 1 else None
+    try:
+        for round_start in range(0, num_shards, shards_per_round):
+            round_end = round_start + shards_per_round
+            jobs = [(seed_sequence, shard_length, walkers, jail_immediately, warmup_turns, real_decks)
+                    for seed_sequence, shard_length in zip(seed_sequences[round_start:round_end],
+                                                           turns[round_start:round_end])]
+            if pool:
+                shard_counts.extend(pool.starmap(simulate_shard, jobs))
+            else:
+                shard_counts.extend(simulate_shard(*job) for job in jobs)
+
+            # The spread of the shards' frequencies, weighted by their turns, gives the standard error of the mean
+            shard_turns_run = np.array(turns[:len(shard_counts)])
+            frequencies = np.array(shard_counts) / shard_turns_run[:, None]
+            weights = shard_turns_run / shard_turns_run.sum()
+            mean = weights @ frequencies
+            num_run = len(shard_counts)
+            standard_errors = (np.sqrt((weights ** 2) @ (frequencies - mean) ** 2 * num_run / (num_run - 1))
+                               if num_run > 1 else np.full(frequencies.shape[1], np.nan))
+            converged = tolerance is not None and len(shard_counts) > 1 and standard_errors.max() <= tolerance
+            if converged:
+                break
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    counts = np.sum(shard_counts, axis=0)
+    turns_run = sum(turns[:len(shard_counts)])
+    return {
+        "counts": counts,
+        "turns": turns_run,
+        "shards": len(shard_counts),
+        "frequencies": counts / turns_run,
+        "standard_errors": standard_errors,
+        "converged": converged,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate a player moving around a Monopoly board.")
+    parser.add_argument("--turns", type=int, default=num_turns, help="number of turns to simulate")
+    parser.add_argument("--leave-jail-immediately", action="store_true", help="pay to leave jail immediately")
+    parser.add_argument("--vectorized", action="store_true", help="move many players at once with NumPy")
+    parser.add_argument("--walkers", type=int, default=100000, help="number of players moved at once when vectorized")
+    parser.add_argument("--seed", type=int, help="seed for the random number generator")
+    parser.add_argument("--parallel", action="store_true",
+                        help="split the vectorized simulation into seeded shards run across worker processes")
+    parser.add_argument("--workers", type=int, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("--shard-turns", type=int, default=10000000, help="number of turns in each shard")
+    parser.add_argument("--real-decks", action="store_true",
+                        help="draw cards from shuffled decks instead of at random when vectorized or parallel")
+    parser.add_argument("--tolerance", type=float,
+                        help="stop once every space's frequency has a standard error within this")
+    args = parser.parse_args()
+    if args.parallel and (args.turns < 1 or args.shard_turns < 1):
+        parser.error("--parallel needs --turns and --shard-turns of at least 1")
+    num_turns = args.turns
+    leave_jail_immediately = args.leave_jail_immediately
+
+    start_time = perf_counter()
+    standard_errors = None
+    if args.parallel:
+        result = simulate_sharded(num_turns, args.shard_turns, args.seed, args.workers, args.tolerance,
+                                  walkers=args.walkers, jail_immediately=leave_jail_immediately,
+                                  real_decks=args.real_decks)
+        num_turns = result["turns"]
+        counter = dict(zip(spaces, result["counts"].tolist()))
+        standard_errors = dict(zip(spaces, result["standard_errors"].tolist()))
+        if args.tolerance is not None:
+            print(f"{'Reached' if result['converged'] else 'Did not reach'} a standard error of {args.tolerance} "
+                  f"after {result['shards']} shards")
+    elif args.vectorized:
+        simulate = simulate_decks if args.real_decks else simulate_vectorized
+        counts = simulate(num_turns, args.walkers, leave_jail_immediately, np.random.default_rng(args.seed))
+        counter = dict(zip(spaces, counts.tolist()))
+    else:
+        random.seed(args.seed)
+
+        # Builds a dictionary to keep track of how many times each space has been landed on
+        counter = dict(zip(spaces, [0 for i in range(len(spaces))]))
+        num_doubles = 0
+        jail_rolls = 0
 
-# Runs the simulation
-current_space = space_to_num["Go"]
-for i in range(num_turns):
-    take_turn()
-    counter[num_to_space[current_space]] += 1
+        # Runs the simulation
+        current_space = space_to_num["Go"]
+        for i in range(num_turns):
+            take_turn()
+            counter[num_to_space[current_space]] += 1
+    elapsed = perf_counter() - start_time
 
-print_results()
+    print_results(standard_errors)
+    print(f"Simulated {num_turns:,} turns in {elapsed:.2f}s ({num_turns / elapsed:,.0f} turns per second)")